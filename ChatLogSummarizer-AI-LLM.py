@@ -1,425 +1,3417 @@
-import json
-import csv
-import re
-from io import StringIO
-
-class ChatLogSummarizer:
-    def __init__(self):
-        # Define word lists for sentiment analysis
-        self.positive_words = ["happy", "great", "satisfied", "good", "excellent"]
-        self.negative_words = ["problem", "issue", "complaint", "bad", "unsatisfied"]
-        
-        # Define category keywords
-        self.category_keywords = {
-            "Critique": ["criticize", "dislike", "disappointed"],
-            "Feedback": ["feedback", "suggestion", "input"],
-            "Positive Response": ["thank you", "great", "happy", "appreciate"],
-            "Complaint": ["complaint", "issue", "problem", "unsatisfied"],
-        }
-        
-        # Category priority order for ties
-        self.category_priority = ["Complaint", "Critique", "Feedback", "Positive Response", "Other"]
-    
-    def parse_input(self, data_input, format_type):
-        """Parse and validate input data"""
-        records = []
-        errors = []
-        
-        try:
-            if format_type == "csv":
-                csv_reader = csv.DictReader(StringIO(data_input))
-                records = list(csv_reader)
-            elif format_type == "json":
-                data = json.loads(data_input)
-                records = data.get("conversations", [])
-            else:
-                return [], ["ERROR: Invalid data format. Please provide data in CSV or JSON format."]
-        except Exception as e:
-            return [], [f"ERROR: Failed to parse input data. {str(e)}"]
-        
-        # Validate records
-        for i, record in enumerate(records):
-            # Check for required fields
-            missing_fields = []
-            for field in ["conversation_id", "sender", "timestamp", "message"]:
-                if field not in record or not record[field]:
-                    if field == "message":
-                        errors.append(f"ERROR: 'message' field cannot be empty in row {i+1}.")
-                    else:
-                        missing_fields.append(field)
-            
-            if missing_fields:
-                errors.append(f"ERROR: Missing required field(s): {', '.join(missing_fields)} in row {i+1}.")
-        
-        return records, errors
-    
-    def validate_data(self, records):
-        """Generate data validation report"""
-        validation_report = "# Data Validation Report\n"
-        validation_report += "## 1. Data Structure Check:\n"
-        
-        # Group records by conversation_id
-        conversations = {}
-        for record in records:
-            conversation_id = record["conversation_id"]
-            if conversation_id not in conversations:
-                conversations[conversation_id] = []
-            conversations[conversation_id].append(record)
-        
-        validation_report += f"- Total conversations processed: {len(conversations)}\n"
-        validation_report += f"- Total fields per record: 4\n\n"
-        
-        validation_report += "## 2. Required Fields Check:\n"
-        validation_report += "- conversation_id: present\n"
-        validation_report += "- sender: present\n"
-        validation_report += "- timestamp: present\n"
-        validation_report += "- message: present\n\n"
-        
-        validation_report += "## 3. Data Content Validation:\n"
-        validation_report += "- \"message\" field not empty: validated\n\n"
-        
-        validation_report += "Validation Summary:\n"
-        validation_report += "Data validation is successful! Proceeding with analysis...\n\n"
-        
-        return validation_report, conversations
-    
-    def calculate_conversation_metrics(self, messages):
-        """Calculate metrics for a conversation"""
-        total_messages = len(messages)
-        total_words = sum(len(msg["message"].split()) for msg in messages)
-        avg_words = round(total_words / total_messages, 2) if total_messages > 0 else 0
-        conversation_detail = "Detailed" if avg_words >= 20 else "Brief"
-        
-        return {
-            "total_messages": total_messages,
-            "total_words": total_words,
-            "avg_words": avg_words,
-            "conversation_detail": conversation_detail
-        }
-    
-    def calculate_sentiment(self, messages):
-        """Calculate sentiment scores for a conversation"""
-        all_text = " ".join(msg["message"].lower() for msg in messages)
-        
-        positive_count = sum(all_text.count(word) for word in self.positive_words)
-        negative_count = sum(all_text.count(word) for word in self.negative_words)
-        
-        sentiment_score = positive_count - negative_count
-        
-        if sentiment_score > 0:
-            sentiment_category = "Positive"
-        elif sentiment_score < 0:
-            sentiment_category = "Negative"
-        else:
-            sentiment_category = "Neutral"
-        
-        return {
-            "positive_count": positive_count,
-            "negative_count": negative_count,
-            "sentiment_score": sentiment_score,
-            "sentiment_category": sentiment_category
-        }
-    
-    def categorize_chat(self, messages):
-        """Categorize chat based on keywords"""
-        categories = {cat: 0 for cat in list(self.category_keywords.keys()) + ["Other"]}
-        
-        for msg in messages:
-            message_text = msg["message"].lower()
-            categorized = False
-            
-            for category, keywords in self.category_keywords.items():
-                for keyword in keywords:
-                    if keyword.lower() in message_text:
-                        categories[category] += 1
-                        categorized = True
-                        break
-                if categorized:
-                    break
-            
-            if not categorized:
-                categories["Other"] += 1
-        
-        # Determine dominant category
-        max_count = max(categories.values())
-        dominant_categories = [cat for cat, count in categories.items() if count == max_count]
-        
-        if len(dominant_categories) == 1:
-            dominant_category = dominant_categories[0]
-        else:
-            # Use priority order for tie-breaking
-            for category in self.category_priority:
-                if category in dominant_categories:
-                    dominant_category = category
-                    break
-        
-        # Generate recommendation based on dominant category
-        recommendations = {
-            "Complaint": "This conversation primarily consists of complaints. It is advised to immediately reach out to the customer, investigate the issue in detail, and provide prompt resolution and compensation if appropriate to restore satisfaction.",
-            "Critique": "This conversation mainly contains critiques. It is recommended to acknowledge the customer's concerns, express understanding, and communicate a clear plan of action to address and improve upon the issues raised.",
-            "Feedback": "This conversation is driven by customer feedback. It is suggested to thank the customer for their input, ensure that their suggestions are noted, and invite them to provide further insights to help improve services.",
-            "Positive Response": "This conversation reflects a positive customer sentiment. It is recommended to encourage the customer to share their positive experience publicly and maintain this level of service.",
-            "Other": "This conversation does not clearly fall into a specific category. Standard customer service follow-up is advised to ensure that all customer queries are addressed appropriately."
-        }
-        
-        return {
-            "category_counts": categories,
-            "dominant_category": dominant_category,
-            "recommendation": recommendations[dominant_category]
-        }
-    
-    def analyze_conversations(self, conversations):
-        """Analyze all conversations and generate report"""
-        formulas_section = "# Formulas Used:\n"
-        formulas_section += "1. Average Words per Message:\n"
-        formulas_section += "   $$ \\text{Average Words} = \\frac{\\text{Total Words}}{\\text{Total Messages}} $$\n"
-        formulas_section += "2. Sentiment Score:\n"
-        formulas_section += "   $$ \\text{Sentiment Score} = \\text{(Count of Positive Words)} - \\text{(Count of Negative Words)} $$\n\n"
-        
-        summary_section = "# Conversation Analysis Summary:\n"
-        summary_section += f"- Total Conversations Evaluated: {len(conversations)}\n\n"
-        
-        detailed_section = "# Detailed Analysis for Each Conversation:\n"
-        
-        for conv_id, messages in conversations.items():
-            # Calculate metrics
-            metrics = self.calculate_conversation_metrics(messages)
-            sentiment = self.calculate_sentiment(messages)
-            categorization = self.categorize_chat(messages)
-            
-            detailed_section += f"## Conversation ID: {conv_id}\n\n"
-            
-            # Input Data Summary
-            detailed_section += "### Input Data Summary:\n"
-            detailed_section += f"- Total Messages: {metrics['total_messages']}\n"
-            detailed_section += f"- Total Words: {metrics['total_words']}\n"
-            detailed_section += f"- Average Words per Message: {metrics['avg_words']} words\n\n"
-            
-            # Step-by-Step Calculations
-            detailed_section += "### Step-by-Step Calculations:\n"
-            detailed_section += "1. **Calculate Total Messages:**\n"
-            detailed_section += f"   - Count of messages in conversation: {metrics['total_messages']}\n\n"
-            
-            detailed_section += "2. **Calculate Total Words:**\n"
-            detailed_section += "   - Words from each message:\n"
-            for i, msg in enumerate(messages):
-                word_count = len(msg["message"].split())
-                detailed_section += f"     - Message {i+1}: {word_count} words\n"
-            detailed_section += f"   - Sum of all word counts: {metrics['total_words']} words\n\n"
-            
-            detailed_section += "3. **Calculate the Average Words per Message:**\n"
-            detailed_section += f"   - Average Words = Total Words / Total Messages\n"
-            detailed_section += f"   - Average Words = {metrics['total_words']} / {metrics['total_messages']} = {metrics['avg_words']} words\n\n"
-            
-            detailed_section += "4. **Determine Conversation Detail Level:**\n"
-            detailed_section += f"   - IF Average Words ({metrics['avg_words']}) ≥ 20, THEN \"Detailed\"\n"
-            detailed_section += f"   - ELSE \"Brief\"\n"
-            detailed_section += f"   - Result: Conversation is \"{metrics['conversation_detail']}\"\n\n"
-            
-            detailed_section += "5. **Sentiment Analysis:**\n"
-            detailed_section += "   - Count of positive words in all messages:\n"
-            detailed_section += f"     - Words checked: {', '.join(self.positive_words)}\n"
-            detailed_section += f"     - Count: {sentiment['positive_count']}\n"
-            detailed_section += "   - Count of negative words in all messages:\n"
-            detailed_section += f"     - Words checked: {', '.join(self.negative_words)}\n"
-            detailed_section += f"     - Count: {sentiment['negative_count']}\n"
-            detailed_section += "   - Sentiment Score calculation:\n"
-            detailed_section += f"     - Sentiment Score = Positive Words Count - Negative Words Count\n"
-            detailed_section += f"     - Sentiment Score = {sentiment['positive_count']} - {sentiment['negative_count']} = {sentiment['sentiment_score']}\n"
-            detailed_section += "   - Sentiment categorization:\n"
-            detailed_section += f"     - IF Score ({sentiment['sentiment_score']}) > 0, THEN \"Positive\"\n"
-            detailed_section += f"     - ELSE IF Score ({sentiment['sentiment_score']}) < 0, THEN \"Negative\"\n"
-            detailed_section += f"     - ELSE \"Neutral\"\n"
-            detailed_section += f"     - Result: Sentiment is \"{sentiment['sentiment_category']}\"\n\n"
-            
-            detailed_section += "6. **Chat Categorization:**\n"
-            detailed_section += "   - Keyword counts for each category:\n"
-            for category, count in categorization["category_counts"].items():
-                if category != "Other":
-                    keywords = self.category_keywords[category]
-                    detailed_section += f"     - {category}: {count} (Keywords: {', '.join(keywords)})\n"
-                else:
-                    detailed_section += f"     - {category}: {count} (No specific keywords matched)\n"
-            
-            detailed_section += "   - Determining dominant category:\n"
-            if len([cat for cat, count in categorization["category_counts"].items() if count == max(categorization["category_counts"].values())]) == 1:
-                detailed_section += f"     - Category with highest count: {categorization['dominant_category']}\n"
-            else:
-                detailed_section += "     - Multiple categories tied with highest count\n"
-                detailed_section += f"     - Using priority order: Complaint > Critique > Feedback > Positive Response > Other\n"
-                detailed_section += f"     - Highest priority category among ties: {categorization['dominant_category']}\n"
-            
-            detailed_section += "\n7. **Customer Service Enhancement Recommendation:**\n"
-            detailed_section += f"   - Based on dominant category \"{categorization['dominant_category']}\"\n"
-            detailed_section += f"   - Recommendation: {categorization['recommendation']}\n\n"
-            
-            # Final Summary
-            detailed_section += "### Final Summary:\n"
-            detailed_section += f"- Conversation Detail: {metrics['conversation_detail']}\n"
-            detailed_section += f"- Sentiment Category: {sentiment['sentiment_category']}\n"
-            detailed_section += f"- Dominant Chat Category: {categorization['dominant_category']}\n"
-            detailed_section += f"- Service Recommendation: {categorization['recommendation']}\n\n"
-        
-        feedback_request = "# Feedback Request\n\n"
-        feedback_request += "Would you like detailed calculations for any specific conversation? Please rate this analysis on a scale of 1-5.\n"
-        
-        return formulas_section + summary_section + detailed_section + feedback_request
-    
-    def process_data(self, data_input, format_type):
-        """Process input data and generate full report"""
-        records, errors = self.parse_input(data_input, format_type)
-        
-        if errors:
-            return "\n".join(errors)
-        
-        validation_report, conversations = self.validate_data(records)
-        analysis_report = self.analyze_conversations(conversations)
-        
-        return validation_report + analysis_report
-    
-    def greeting(self, message):
-        """Generate appropriate greeting based on user message"""
-        message_lower = message.lower()
-        
-        # Check for urgency keywords
-        if any(word in message_lower for word in ["urgent", "asap", "emergency"]):
-            return "ChatLogSummarizer-AI here! Let's quickly analyze your chat logs."
-        
-        # Extract name if provided
-        name_match = re.search(r"my name is (\w+)", message_lower)
-        if name_match:
-            name = name_match.group(1)
-            return f"Hello, {name}! I'm ChatLogSummarizer-AI, here to assist you with your chat log analysis."
-        
-        # Check for mood keywords
-        if any(word in message_lower for word in ["happy", "excited", "joyful", "great"]):
-            return "Hello! It's great to see your positive tone. I'm here to help summarize your chat logs!"
-        
-        if any(word in message_lower for word in ["sad", "down", "unhappy"]):
-            return "Hello. I'm sorry you're feeling down. Let's work together to analyze your chat logs for insights."
-        
-        if any(word in message_lower for word in ["angry", "frustrated", "mad"]):
-            return "Hello. I understand you're frustrated. Let's carefully review your chat logs for actionable insights."
-        
-        # Default greeting
-        return "Greetings! I am ChatLogSummarizer-AI, your assistant for categorizing and summarizing chat/email logs. Please share your chat log data in CSV or JSON format to begin."
-
-# Example usage
-def main():
-    summarizer = ChatLogSummarizer()
-    # # Example data
-    # example_csv = """conversation_id,sender,timestamp,message
-    # conv1,customer,01-02-2023,"Hello, I have a problem with my order."
-    # conv1,agent,01-02-2023,"I'm sorry to hear that. What seems to be the issue?"
-    # conv1,customer,01-02-2023,"The product arrived damaged. I'm very unhappy with this."
-    # conv1,agent,01-02-2023,"I apologize for the inconvenience. We'll send a replacement right away."
-    # conv2,customer,02-02-2023,"Thank you for the excellent service! I'm very happy with my purchase."
-    # conv2,agent,02-02-2023,"You're welcome! We're glad you had a great experience."
-    # """
-    # # Process CSV data
-    # print("=== CSV Data Analysis ===")
-    # csv_report = summarizer.process_data(example_csv, "csv")
-    # print(csv_report)
-    
-    example_json = """{
-    "conversations": [
-        {
-        "conversation_id": "conv100",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "I need help with my account."
-        },
-        {
-        "conversation_id": "conv100",
-        "sender": "agent",
-        "timestamp": "12-03-2021",
-        "message": "Sure, I can help you with your account details."
-        },
-        {
-        "conversation_id": "conv100",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "I forgot my password and cannot log in."
-        },
-        {
-        "conversation_id": "conv100",
-        "sender": "agent",
-        "timestamp": "12-03-2021",
-        "message": "Please try resetting your password using the 'Forgot Password' link."
-        },
-        {
-        "conversation_id": "conv100",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "I will try that, thank you."
-        },
-        {
-        "conversation_id": "conv101",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "I recently updated the software and noticed several performance issues, including slow loading times and frequent crashes that disrupt my workflow significantly."
-        },
-        {
-        "conversation_id": "conv101",
-        "sender": "agent",
-        "timestamp": "12-03-2021",
-        "message": "We apologize for the inconvenience caused by the update; our technical team is actively investigating these performance issues and working on a patch to enhance stability and speed."
-        },
-        {
-        "conversation_id": "conv101",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "The update not only affected performance but also changed the interface drastically, making it difficult to navigate, which has impacted my overall user experience."
-        },
-        {
-        "conversation_id": "conv101",
-        "sender": "agent",
-        "timestamp": "12-03-2021",
-        "message": "Thank you for your detailed feedback; we are documenting your concerns and will prioritize improvements in our next update to ensure a better user experience."
-        },
-        {
-        "conversation_id": "conv101",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "I appreciate the prompt response and detailed explanation regarding the ongoing efforts to resolve these issues."
-        },
-        {
-        "conversation_id": "conv102",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "I am very satisfied with the recent improvements in the service quality and customer support."
-        },
-        {
-        "conversation_id": "conv102",
-        "sender": "agent",
-        "timestamp": "12-03-2021",
-        "message": "Thank you for your positive feedback; we are glad you enjoy the new design and improved features."
-        },
-        {
-        "conversation_id": "conv102",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "The new features have improved navigation and overall functionality remarkably."
-        },
-        {
-        "conversation_id": "conv102",
-        "sender": "agent",
-        "timestamp": "12-03-2021",
-        "message": "We appreciate your kind words and are committed to further enhancing our service."
-        },
-        {
-        "conversation_id": "conv102",
-        "sender": "customer",
-        "timestamp": "12-03-2021",
-        "message": "Please keep up the great work and continue to listen to your customers."
-        }
-    ]
-    }
-"""
-    
-    print("\n\n=== JSON Data Analysis ===")
-    json_report = summarizer.process_data(example_json, "json")
-    print(json_report)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import json
+import csv
+import argparse
+import asyncio
+import re
+import os
+import sys
+import io
+import codecs
+import hashlib
+import sqlite3
+import heapq
+import time
+import tempfile
+import shutil
+import signal
+import zlib
+import mmap
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from io import StringIO
+from http import HTTPStatus
+from urllib.parse import parse_qsl
+from collections import OrderedDict, deque
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+REQUIRED_FIELDS = ["conversation_id", "sender", "timestamp", "message"]
+JSON_RECORD_KEYS = frozenset(REQUIRED_FIELDS)
+
+# Size of the chunks read from disk by the streaming parsers
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Characters that can continue a JSON number
+NUMBER_CHARACTERS = "0123456789.eE+-"
+
+# Bytes of whole CSV lines decoded at a time by the CSV fast path
+CSV_SCAN_CHUNK_SIZE = 1 << 20
+
+# Number of hash partitions used when grouping spills to disk, and the most
+# parts a partition over the memory limit is split into
+SPILL_PARTITIONS = 64
+
+# Approximate per-record memory beyond the message text (slots object, interned strings, list slot)
+RECORD_OVERHEAD_BYTES = 200
+
+# Number of shards handed to each worker in parallel analysis, to balance uneven conversations
+SHARDS_PER_WORKER = 4
+
+# Upper bound on conversations per shard, which keeps streamed parallel runs in bounded memory
+MAX_SHARD_SIZE = 256
+
+# Number of conversations looked up and stored per result cache round trip
+CACHE_BATCH_SIZE = 1000
+
+# Time-window granularities and their bucket length in seconds
+WINDOW_HOUR = "hour"
+WINDOW_DAY = "day"
+WINDOW_SECONDS = {WINDOW_HOUR: 3600, WINDOW_DAY: 86400}
+
+# Day-first timestamp formats accepted after ISO 8601, e.g. "12-03-2021"
+TIMESTAMP_FORMATS = ["%d-%m-%Y %H:%M:%S", "%d-%m-%Y %H:%M", "%d-%m-%Y", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y"]
+
+# Number of distinct timestamp strings whose parsed value is cached
+TIMESTAMP_CACHE_SIZE = 1 << 16
+
+# Rule set used when a summarizer is created without a lexicon
+DEFAULT_LEXICON = {
+    "positive_words": ["happy", "great", "satisfied", "good", "excellent"],
+    "negative_words": ["problem", "issue", "complaint", "bad", "unsatisfied"],
+    "category_keywords": {
+        "Critique": ["criticize", "dislike", "disappointed"],
+        "Feedback": ["feedback", "suggestion", "input"],
+        "Positive Response": ["thank you", "great", "happy", "appreciate"],
+        "Complaint": ["complaint", "issue", "problem", "unsatisfied"],
+    },
+    "category_priority": ["Complaint", "Critique", "Feedback", "Positive Response", "Other"],
+    "recommendations": {
+        "Complaint": "This conversation primarily consists of complaints. It is advised to immediately reach out to the customer, investigate the issue in detail, and provide prompt resolution and compensation if appropriate to restore satisfaction.",
+        "Critique": "This conversation mainly contains critiques. It is recommended to acknowledge the customer's concerns, express understanding, and communicate a clear plan of action to address and improve upon the issues raised.",
+        "Feedback": "This conversation is driven by customer feedback. It is suggested to thank the customer for their input, ensure that their suggestions are noted, and invite them to provide further insights to help improve services.",
+        "Positive Response": "This conversation reflects a positive customer sentiment. It is recommended to encourage the customer to share their positive experience publicly and maintain this level of service.",
+        "Other": "This conversation does not clearly fall into a specific category. Standard customer service follow-up is advised to ensure that all customer queries are addressed appropriately."
+    },
+    "word_boundaries": False
+}
+
+# Number of compiled keyword matchers kept for reuse across lexicons with identical rules
+MATCHER_CACHE_SIZE = 32
+
+# Lexicons with at most this many patterns are matched with one str.count or `in`
+# per pattern, which is faster than stepping the automaton character by character
+DIRECT_SCAN_MAX_PATTERNS = 40
+
+# Highest code point for which str.isspace() is true (U+3000, ideographic space)
+MAX_WHITESPACE_CODE = 0x3000
+
+# Report verbosity levels; "summary" leaves out the per-message word counts
+VERBOSITY_FULL = "full"
+VERBOSITY_SUMMARY = "summary"
+
+
+# Compiled keyword matchers by lexicon fingerprint, least recently used first
+_matcher_cache = OrderedDict()
+
+# Summarizer attributes that hold the editable lexicon
+LEXICON_ATTRIBUTES = frozenset(("positive_words", "negative_words", "category_keywords", "category_priority",
+                                "recommendations", "word_boundaries"))
+
+
+def intern_value(value):
+    """Intern strings that repeat across many records"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Message:
+    """Compact chat message record
+    
+    Stores the four record fields in slots instead of a per-row dict, with
+    conversation_id, sender and timestamp interned so repeated values share
+    one string. Supports the dict-style access (`msg["message"]`, `in`,
+    `get`) that the analysis methods use.
+    """
+    
+    __slots__ = ("conversation_id", "sender", "timestamp", "message")
+    
+    def __init__(self, conversation_id, sender, timestamp, message):
+        self.conversation_id = intern_value(conversation_id)
+        self.sender = intern_value(sender)
+        self.timestamp = intern_value(timestamp)
+        self.message = message
+    
+    @classmethod
+    def from_mapping(cls, record):
+        """Create a message from a dict-like record; missing fields become None"""
+        return cls(record.get("conversation_id"), record.get("sender"), record.get("timestamp"), record.get("message"))
+    
+    def __getitem__(self, field):
+        if field not in Message.__slots__:
+            raise KeyError(field)
+        return getattr(self, field)
+    
+    def __contains__(self, field):
+        return field in Message.__slots__ and getattr(self, field) is not None
+    
+    def get(self, field, default=None):
+        """Return a field value, or `default` if it is missing"""
+        value = getattr(self, field, None) if field in Message.__slots__ else None
+        return default if value is None else value
+    
+    def as_dict(self):
+        """Return the record as a plain dict"""
+        return {field: getattr(self, field) for field in Message.__slots__}
+    
+    def __eq__(self, other):
+        if not isinstance(other, Message):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in Message.__slots__)
+    
+    def __repr__(self):
+        return f"Message({self.conversation_id!r}, {self.sender!r}, {self.timestamp!r}, {self.message!r})"
+
+
+def json_record_pairs(pairs):
+    """object_pairs_hook that decodes complete JSON records straight into Messages
+    
+    Objects with exactly the four REQUIRED_FIELDS as string values become
+    Messages without an intermediate dict being kept; any other object stays
+    a dict and is checked and converted by the caller as before.
+    """
+    if len(pairs) == len(REQUIRED_FIELDS):
+        # Exports almost always list the fields in REQUIRED_FIELDS order
+        (key0, value0), (key1, value1), (key2, value2), (key3, value3) = pairs
+        if (key0 == "conversation_id" and key1 == "sender" and key2 == "timestamp" and key3 == "message"
+                and type(value0) is str and type(value1) is str and type(value2) is str and type(value3) is str):
+            return Message(value0, value1, value2, value3)
+        record = dict(pairs)
+        if record.keys() == JSON_RECORD_KEYS and all(type(value) is str for value in record.values()):
+            return Message.from_mapping(record)
+        return record
+    return dict(pairs)
+
+
+@contextmanager
+def open_source(source):
+    """Open a file path as a binary stream, or pass a binary file object through"""
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, "rb") as stream:
+            yield stream
+    else:
+        yield source
+
+
+def iter_csv_records(stream):
+    """Yield CSV rows one at a time from a binary stream"""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        # Hand the underlying stream back to its owner instead of closing it
+        text.detach()
+
+
+def scan_csv_buffer(buffer):
+    """Parse a four-column CSV export held in a bytes-like buffer, such as an mmap, into Messages
+    
+    Returns None when the header is not exactly the four REQUIRED_FIELDS, so
+    the caller can fall back to csv.DictReader. The buffer is decoded one
+    CSV_SCAN_CHUNK_SIZE stretch of whole lines at a time and plain rows are
+    split on commas directly. Stretches with quotes, stray carriage returns
+    or NUL bytes go through the csv module row by row, so quoted commas,
+    quotes and newlines come out exactly as csv.DictReader reads them, as
+    do short and long rows.
+    """
+    size = len(buffer)
+    start = len(codecs.BOM_UTF8) if buffer[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+    
+    header_end = buffer.find(b"\n", start)
+    if header_end < 0:
+        header_end = size
+    header = buffer[start:header_end]
+    if header.endswith(b"\r"):
+        header = header[:-1]
+    if b'"' in header or b"\r" in header or b"\x00" in header:
+        return None
+    fieldnames = header.decode("utf-8").split(",")
+    if sorted(fieldnames) != sorted(REQUIRED_FIELDS):
+        return None
+    columns = [fieldnames.index(field) for field in REQUIRED_FIELDS]
+    in_order = columns == list(range(len(REQUIRED_FIELDS)))
+    
+    field_limit = csv.field_size_limit()
+    find = buffer.find
+    records = []
+    append = records.append
+    position = header_end + 1
+    
+    def remaining_lines():
+        # Lines for the csv module, consumed only as far as the current record needs
+        nonlocal position
+        while position < size:
+            end = find(b"\n", position)
+            end = size if end < 0 else end + 1
+            line = buffer[position:end]
+            position = end
+            yield line.decode("utf-8")
+    
+    while position < size:
+        # Take a stretch of whole lines, or one line if it is longer than a stretch
+        chunk_end = size
+        if position + CSV_SCAN_CHUNK_SIZE < size:
+            chunk_end = buffer.rfind(b"\n", position, position + CSV_SCAN_CHUNK_SIZE) + 1
+            if chunk_end <= position:
+                chunk_end = find(b"\n", position) + 1 or size
+        chunk = buffer[position:chunk_end]
+        
+        lines = None
+        if b'"' not in chunk and b"\x00" not in chunk and chunk.count(b"\r") == chunk.count(b"\r\n"):
+            text = chunk.decode("utf-8")
+            if "\r" in text:
+                text = text.replace("\r\n", "\n")
+            lines = text.split("\n")
+            if max(map(len, lines)) > field_limit:
+                lines = None
+        
+        if lines is not None:
+            position = chunk_end
+            for line in lines:
+                if not line:
+                    continue
+                fields = line.split(",")
+                if in_order and len(fields) == 4:
+                    append(Message(*fields))
+                else:
+                    append(Message(*[fields[column] if column < len(fields) else None for column in columns]))
+            continue
+        
+        # Rows that need the csv module's quoting rules
+        while position < chunk_end:
+            row = next(csv.reader(remaining_lines()), [])
+            if row:
+                append(Message(*[row[column] if column < len(row) else None for column in columns]))
+    
+    return records
+
+
+class ConversationOrderError(ValueError):
+    """Raised when streamed records are not grouped by conversation_id"""
+
+
+def iter_batches(items, size):
+    """Group an iterable into lists of at most `size` items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class StreamedConversations:
+    """Read-once view of streamed (conversation_id, messages) groups with a known count"""
+    
+    def __init__(self, groups, count):
+        self.groups = groups
+        self.count = count
+    
+    def __len__(self):
+        return self.count
+    
+    def items(self):
+        return self.groups
+
+
+class SpilledConversations:
+    """Out-of-core grouping of records by conversation_id
+    
+    Records are hash-partitioned by conversation_id into temporary spill
+    files, each line tagged with the record's position in the input. A
+    partition whose estimated size is over `memory_limit` is split again by
+    the remaining hash bits until its parts fit. Each part is then grouped in
+    memory on its own and written back sorted by first appearance, and
+    `items()` merges the sorted parts so conversations come out in the same
+    order as the in-memory grouping. A single conversation larger than the
+    limit is still grouped whole. Only one conversation per part is held in
+    memory while reading.
+    """
+    
+    def __init__(self, partitions=SPILL_PARTITIONS, temp_dir=None, memory_limit=None):
+        self.directory = tempfile.TemporaryDirectory(prefix="chatlog-spill-", dir=temp_dir)
+        self.partition_count = partitions
+        self.memory_limit = memory_limit
+        self.conversation_count = 0
+        self._row = 0
+        self._files = [
+            open(os.path.join(self.directory.name, f"partition-{i}.jsonl"), "w", encoding="utf-8")
+            for i in range(partitions)
+        ]
+        self._sizes = [0] * partitions
+        self._sorted_paths = None
+    
+    def add(self, record):
+        """Append a record to its conversation's partition"""
+        conversation_id = record["conversation_id"]
+        key = zlib.crc32(str(conversation_id).encode("utf-8"))
+        partition = key % self.partition_count
+        # The unused part of the hash is kept for splitting the partition later
+        line = [self._row, key // self.partition_count, conversation_id, record["sender"], record["timestamp"], record["message"]]
+        self._files[partition].write(json.dumps(line, ensure_ascii=False) + "\n")
+        self._sizes[partition] += estimate_record_size(record)
+        self._row += 1
+    
+    def finish(self):
+        """Group each partition in memory and rewrite it sorted by first appearance"""
+        self._sorted_paths = []
+        for spill, size in zip(self._files, self._sizes):
+            spill.close()
+            if size:
+                self._sorted_paths.append(self._sort_partition(spill.name, size))
+            else:
+                os.remove(spill.name)
+        self._files = []
+    
+    def _sort_partition(self, path, size):
+        """Group one spill file and write it back sorted, returning the sorted file's path
+        
+        A file over the memory limit is split and its parts are sorted on
+        their own, then merged back into one sorted file, so the number of
+        files `items()` reads at once stays at the partition count.
+        """
+        if self.memory_limit is not None and size > self.memory_limit:
+            parts, shared_key = self._split(path, max(2, min(self.partition_count, 2 * -(-size // self.memory_limit))))
+            if not shared_key:
+                return self._merge_sorted([self._sort_partition(part_path, part_size) for part_path, part_size in parts])
+            # Every record has the same hash, which is almost always one large conversation
+            path, size = parts[0]
+        
+        groups = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                row, _, conversation_id, sender, timestamp, message = json.loads(line)
+                # Lines are in input order, so a group's first row is its first appearance
+                groups.setdefault(conversation_id, [row, []])[1].append([sender, timestamp, message])
+        os.remove(path)
+        self.conversation_count += len(groups)
+        
+        sorted_path = f"{path}.sorted"
+        with open(sorted_path, "w", encoding="utf-8") as f:
+            for conversation_id, (row, messages) in sorted(groups.items(), key=lambda group: group[1][0]):
+                f.write(json.dumps([row, conversation_id, messages], ensure_ascii=False) + "\n")
+        return sorted_path
+    
+    def _merge_sorted(self, paths):
+        """Merge sorted files into one, returning its path"""
+        if len(paths) == 1:
+            return paths[0]
+        merged_path = f"{paths[0]}.merged"
+        files = [open(path, encoding="utf-8") for path in paths]
+        try:
+            with open(merged_path, "w", encoding="utf-8") as merged:
+                # Sorted lines start with "[row,", so they merge without decoding the messages
+                merged.writelines(heapq.merge(*files, key=lambda line: int(line[1:line.index(",")])))
+        finally:
+            for f in files:
+                f.close()
+        for path in paths:
+            os.remove(path)
+        return merged_path
+    
+    def _split(self, path, count):
+        """Split a spill file into `count` parts by the next hash digit
+        
+        Returns the non-empty (path, size) parts and whether every record
+        had the same remaining hash, in which case no split can separate them.
+        """
+        files = {}
+        sizes = {}
+        keys = set()
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    row, key, conversation_id, sender, timestamp, message = json.loads(line)
+                    if len(keys) < 2:
+                        keys.add(key)
+                    part = key % count
+                    # Part files are opened on first use, since most splits fill only a few of them
+                    part_file = files.get(part)
+                    if part_file is None:
+                        part_file = files[part] = open(f"{path}.{part}", "w", encoding="utf-8")
+                        sizes[part] = 0
+                    part_file.write(json.dumps([row, key // count, conversation_id, sender, timestamp, message], ensure_ascii=False) + "\n")
+                    sizes[part] += RECORD_OVERHEAD_BYTES + len(message)
+        finally:
+            for part_file in files.values():
+                part_file.close()
+        os.remove(path)
+        
+        parts = [(files[part].name, sizes[part]) for part in sorted(files)]
+        return parts, len(keys) == 1
+    
+    def __len__(self):
+        return self.conversation_count
+    
+    def items(self):
+        """Yield (conversation_id, messages) in first-appearance order"""
+        def read_partition(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        
+        partitions = [read_partition(path) for path in self._sorted_paths]
+        for _, conversation_id, messages in heapq.merge(*partitions, key=lambda group: group[0]):
+            yield conversation_id, [Message(conversation_id, sender, timestamp, text) for sender, timestamp, text in messages]
+    
+    def close(self):
+        """Remove the spill files"""
+        for spill in self._files:
+            spill.close()
+        self.directory.cleanup()
+
+
+def estimate_record_size(record):
+    """Rough in-memory size of a grouped record, used against the grouping memory limit"""
+    return RECORD_OVERHEAD_BYTES + len(record["message"])
+
+
+def group_records(records, memory_limit, temp_dir=None):
+    """Group streamed records by conversation_id within a memory budget of `memory_limit` bytes (None for no limit)
+    
+    Records are grouped in memory until the budget is exceeded, then
+    everything is moved to hash-partitioned spill files. Conversations keep
+    their first-appearance order either way. Only meant for records decoded
+    from a stream, whose messages are held solely by the grouping.
+    """
+    conversations = {}
+    used = 0
+    spilled = None
+    for record in records:
+        if spilled is not None:
+            spilled.add(record)
+            continue
+        
+        conversation_id = record["conversation_id"]
+        if conversation_id not in conversations:
+            conversations[conversation_id] = []
+        conversations[conversation_id].append(record)
+        used += estimate_record_size(record)
+        
+        if memory_limit is not None and used > memory_limit:
+            # Over budget: move what we have to disk and spill the rest directly
+            spilled = SpilledConversations(temp_dir=temp_dir, memory_limit=memory_limit)
+            for messages in conversations.values():
+                for message in messages:
+                    spilled.add(message)
+            conversations = None
+    
+    if spilled is None:
+        return conversations
+    spilled.finish()
+    return spilled
+
+
+class JSONStreamReader:
+    """Incremental reader that decodes one JSON value at a time from a binary stream"""
+    
+    def __init__(self, stream, chunk_size=STREAM_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+    
+    def fill(self, size=None):
+        """Read more data into the buffer, returning False at end of stream"""
+        if self.eof:
+            return False
+        
+        # Drop the consumed prefix so the buffer only holds unparsed data
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            return False
+        
+        self.buffer += self.text_decoder.decode(chunk)
+        return True
+    
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+    
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be `char`"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expecting '{char}' but found {found!r}")
+        self.pos += 1
+    
+    def read_value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Only an error at the end of the buffer can mean the value is incomplete;
+                # the tail allows for a cut-off literal or \uXXXX escape
+                incomplete = e.msg == "Unterminated string starting at" or e.pos >= len(self.buffer) - len("\\uXXXX")
+                if not incomplete:
+                    raise
+                # Grow the window geometrically and retry
+                if not self.fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    raise
+                continue
+            
+            # A number cut by the end of the buffer decodes as its prefix, such
+            # as 12 from "12." or "12e", so read on until more than the number follows
+            if (type(value) in (int, float) and not self.eof
+                    and not self.buffer[end:].strip(NUMBER_CHARACTERS)):
+                self.fill()
+                continue
+            
+            self.pos = end
+            return value
+
+
+def iter_json_conversations(stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the items of the top-level "conversations" array one at a time"""
+    reader = JSONStreamReader(stream, chunk_size)
+    
+    if reader.peek() != "{":
+        raise ValueError("Expecting a JSON object with a 'conversations' array")
+    reader.expect("{")
+    
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            key = reader.read_value()
+            reader.expect(":")
+            
+            if key == "conversations" and reader.peek() == "[":
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.expect("]")
+                else:
+                    while True:
+                        yield reader.read_value()
+                        if reader.peek() == "]":
+                            reader.expect("]")
+                            break
+                        reader.expect(",")
+            elif key == "conversations":
+                raise ValueError("'conversations' must be an array")
+            else:
+                # Skip values of any other top-level keys
+                reader.read_value()
+            
+            if reader.peek() == "}":
+                reader.expect("}")
+                break
+            reader.expect(",")
+    
+    if reader.peek():
+        raise ValueError("Extra data after the JSON object")
+
+
+class ScanContext:
+    """Automaton position carried between the messages of one conversation by KeywordMatcher.scan_next"""
+    
+    __slots__ = ("state", "position", "last_end", "started")
+    
+    def __init__(self):
+        self.state = 0
+        self.position = 0
+        self.last_end = {}
+        self.started = False
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds sentiment words and category keywords in one pass
+    
+    Matching follows the substring semantics of the original scans: sentiment
+    words are counted like `str.count` on the space-joined conversation text
+    (non-overlapping occurrences of each word) and a message belongs to the
+    first category, in `category_keywords` order, with a keyword contained in
+    it. With `word_boundaries` set, a match must also be a whole word or
+    phrase within a single message.
+    
+    Small lexicons skip the automaton and scan each message once per pattern,
+    unless a sentiment word contains a space and could match across the
+    separator between two messages.
+    """
+    
+    def __init__(self, positive_words, negative_words, category_keywords, word_boundaries=False):
+        self.word_boundaries = word_boundaries
+        self.categories = list(category_keywords.keys())
+        
+        # Merge every word list into one set of unique patterns
+        pattern_ids = {}
+        self.patterns = []
+        self.positive_weights = []
+        self.negative_weights = []
+        self.pattern_categories = []
+        
+        def add_pattern(pattern):
+            if pattern not in pattern_ids:
+                pattern_ids[pattern] = len(self.patterns)
+                self.patterns.append(pattern)
+                self.positive_weights.append(0)
+                self.negative_weights.append(0)
+                self.pattern_categories.append(-1)
+            return pattern_ids[pattern]
+        
+        # Sentiment words are matched as given; listing a word twice counts it twice
+        for word in positive_words:
+            self.positive_weights[add_pattern(word)] += 1
+        for word in negative_words:
+            self.negative_weights[add_pattern(word)] += 1
+        
+        # Category keywords are lowercased and keep the first category they belong to
+        for index, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                pattern_id = add_pattern(keyword.lower())
+                if self.pattern_categories[pattern_id] < 0:
+                    self.pattern_categories[pattern_id] = index
+        
+        # The empty string matches everywhere, so it is handled outside the automaton
+        empty_id = pattern_ids.get("")
+        if empty_id is None:
+            self.empty_positive = self.empty_negative = 0
+            self.empty_category = -1
+        else:
+            self.empty_positive = self.positive_weights[empty_id]
+            self.empty_negative = self.negative_weights[empty_id]
+            self.empty_category = self.pattern_categories[empty_id]
+        
+        self.direct_scan = (not word_boundaries and len(self.patterns) <= DIRECT_SCAN_MAX_PATTERNS
+                            and not any(" " in pattern for pattern in positive_words)
+                            and not any(" " in pattern for pattern in negative_words))
+        if self.direct_scan:
+            self.sentiment_patterns = [
+                (pattern, self.positive_weights[pattern_id], self.negative_weights[pattern_id])
+                for pattern_id, pattern in enumerate(self.patterns)
+                if self.positive_weights[pattern_id] or self.negative_weights[pattern_id]
+            ]
+            self.category_patterns = [[keyword.lower() for keyword in keywords] for keywords in category_keywords.values()]
+        else:
+            self._build_automaton()
+    
+    def _build_automaton(self):
+        """Compile the patterns into a deterministic transition table"""
+        transitions = [{}]
+        outputs = [[]]
+        
+        # Build the trie
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(transitions)
+                    transitions[state][char] = next_state
+                    transitions.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern_id)
+        
+        # Resolve failure links breadth-first and fold them into the transitions,
+        # so scanning needs exactly one dict lookup per character
+        goto = [dict(edges) for edges in transitions]
+        fail = [0] * len(transitions)
+        queue = list(transitions[0].values())
+        for state in queue:
+            for char, next_state in transitions[state].items():
+                queue.append(next_state)
+                fallback = goto[fail[state]].get(char, 0) if state else 0
+                fail[next_state] = fallback
+                outputs[next_state] = outputs[next_state] + outputs[fallback]
+            if state:
+                merged = dict(goto[fail[state]])
+                merged.update(goto[state])
+                goto[state] = merged
+        
+        self.transitions = goto
+        self.lengths = [len(pattern) for pattern in self.patterns]
+        self.outputs = [tuple(output) if output else None for output in outputs]
+    
+    def scan(self, texts):
+        """Scan lowercased messages, returning per-message positive hits, negative hits and category index
+        
+        Sentiment hits that span two messages are credited to the message
+        they end in. A category index of -1 means no keyword matched.
+        """
+        positive_hits = []
+        negative_hits = []
+        categories = []
+        
+        if self.direct_scan:
+            for text in texts:
+                positive, negative, category = self._scan_direct(text)
+                positive_hits.append(positive)
+                negative_hits.append(negative)
+                categories.append(category)
+            return positive_hits, negative_hits, categories
+        
+        context = ScanContext()
+        for text in texts:
+            separator_positive, separator_negative, positive, negative, category = self.scan_next(text, context)
+            if positive_hits:
+                positive_hits[-1] += separator_positive
+                negative_hits[-1] += separator_negative
+            positive_hits.append(positive)
+            negative_hits.append(negative)
+            categories.append(category)
+        
+        return positive_hits, negative_hits, categories
+    
+    def scan_next(self, text, context):
+        """Scan the next lowercased message of a conversation, resuming from `context`
+        
+        Returns the sentiment hits ending on the separator before the message,
+        the message's own positive and negative hits, and its category index.
+        Summing every hit over all messages gives the same totals as `scan`.
+        """
+        if self.direct_scan:
+            # No sentiment word can span the separator, so no state is carried over
+            return (0, 0) + self._scan_direct(text)
+        
+        transitions = self.transitions
+        outputs = self.outputs
+        lengths = self.lengths
+        positive_weights = self.positive_weights
+        negative_weights = self.negative_weights
+        pattern_categories = self.pattern_categories
+        word_boundaries = self.word_boundaries
+        last_end = context.last_end
+        state = context.state
+        position = context.position
+        
+        separator_positive = separator_negative = 0
+        if context.started:
+            # Feed the separator that joins messages in the sentiment text
+            state = transitions[state].get(" ", 0)
+            position += 1
+            if outputs[state] and not word_boundaries:
+                separator_positive, separator_negative = self._count_sentiment(outputs[state], position, 0, lengths, last_end)
+        context.started = True
+        
+        start_position = position
+        positive = self.empty_positive * (len(text) + 1)
+        negative = self.empty_negative * (len(text) + 1)
+        category = self.empty_category
+        
+        for char in text:
+            state = transitions[state].get(char, 0)
+            position += 1
+            matches = outputs[state]
+            if matches is None:
+                continue
+            
+            for pattern_id in matches:
+                start = position - lengths[pattern_id]
+                if word_boundaries and not self._is_whole_word(text, start - start_position, position - start_position):
+                    continue
+                
+                pattern_category = pattern_categories[pattern_id]
+                if pattern_category >= 0 and start >= start_position and (category < 0 or pattern_category < category):
+                    category = pattern_category
+                
+                # Count non-overlapping occurrences, as str.count does
+                if (positive_weights[pattern_id] or negative_weights[pattern_id]) and start >= last_end.get(pattern_id, 0):
+                    last_end[pattern_id] = position
+                    positive += positive_weights[pattern_id]
+                    negative += negative_weights[pattern_id]
+        
+        context.state = state
+        context.position = position
+        return separator_positive, separator_negative, positive, negative, category
+    
+    def _scan_direct(self, text):
+        """Match one message with a str.count per sentiment word and an `in` test per category keyword"""
+        positive = negative = 0
+        for pattern, positive_weight, negative_weight in self.sentiment_patterns:
+            count = text.count(pattern)
+            if count:
+                positive += count * positive_weight
+                negative += count * negative_weight
+        
+        for index, keywords in enumerate(self.category_patterns):
+            for keyword in keywords:
+                if keyword in text:
+                    return positive, negative, index
+        return positive, negative, -1
+    
+    def _count_sentiment(self, matches, position, start_position, lengths, last_end):
+        """Count sentiment matches ending at `position` that start at or after `start_position`"""
+        positive = negative = 0
+        for pattern_id in matches:
+            start = position - lengths[pattern_id]
+            if start >= start_position and start >= last_end.get(pattern_id, 0):
+                if self.positive_weights[pattern_id] or self.negative_weights[pattern_id]:
+                    last_end[pattern_id] = position
+                    positive += self.positive_weights[pattern_id]
+                    negative += self.negative_weights[pattern_id]
+        return positive, negative
+    
+    @staticmethod
+    def _is_whole_word(text, start, end):
+        """Check that text[start:end] lies within the message and is not part of a longer word"""
+        if start < 0:
+            return False
+        if start > 0 and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            return False
+        if end < len(text) and (text[end].isalnum() or text[end] == "_"):
+            return False
+        return True
+
+
+def lexicon_state(rules):
+    """Complete a rule set with DEFAULT_LEXICON values, returning plain lists and dicts"""
+    rules = dict(rules)
+    for key, value in DEFAULT_LEXICON.items():
+        rules.setdefault(key, value)
+    return {
+        "positive_words": list(rules["positive_words"]),
+        "negative_words": list(rules["negative_words"]),
+        "category_keywords": {category: list(keywords) for category, keywords in rules["category_keywords"].items()},
+        "category_priority": list(rules["category_priority"]),
+        "recommendations": dict(rules["recommendations"]),
+        "word_boundaries": bool(rules["word_boundaries"])
+    }
+
+
+def compile_matcher(state, fingerprint):
+    """Return the KeywordMatcher for a lexicon state, reusing one compiled for an identical state"""
+    matcher = _matcher_cache.get(fingerprint)
+    if matcher is None:
+        matcher = KeywordMatcher(state["positive_words"], state["negative_words"], state["category_keywords"], state["word_boundaries"])
+        _matcher_cache[fingerprint] = matcher
+        if len(_matcher_cache) > MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    else:
+        _matcher_cache.move_to_end(fingerprint)
+    return matcher
+
+
+class CompiledLexicon:
+    """Immutable rule set with its compiled keyword matcher
+    
+    Word lists are stored as tuples and mappings as read-only proxies, so one
+    instance can be shared by any number of summarizers. Pickling keeps the
+    compiled matcher, so worker processes receive it ready to use instead
+    of recompiling it. `name` and `version` identify the registry entry the
+    lexicon was loaded as, if any.
+    """
+    
+    __slots__ = ("name", "version", "positive_words", "negative_words", "category_keywords", "category_priority",
+                 "recommendations", "word_boundaries", "fingerprint", "matcher")
+    
+    def __init__(self, rules, name=None, version=None, matcher=None):
+        state = lexicon_state(rules)
+        fingerprint = hashlib.sha256(json.dumps(state, ensure_ascii=False).encode("utf-8")).hexdigest()
+        values = {
+            "name": name,
+            "version": version,
+            "positive_words": tuple(state["positive_words"]),
+            "negative_words": tuple(state["negative_words"]),
+            "category_keywords": MappingProxyType({category: tuple(keywords) for category, keywords in state["category_keywords"].items()}),
+            "category_priority": tuple(state["category_priority"]),
+            "recommendations": MappingProxyType(state["recommendations"]),
+            "word_boundaries": state["word_boundaries"],
+            "fingerprint": fingerprint,
+            "matcher": matcher or compile_matcher(state, fingerprint)
+        }
+        for field, value in values.items():
+            object.__setattr__(self, field, value)
+    
+    def __setattr__(self, field, value):
+        raise AttributeError("CompiledLexicon is immutable")
+    
+    def __reduce__(self):
+        return (CompiledLexicon, (self.state(), self.name, self.version, self.matcher))
+    
+    def __repr__(self):
+        return f"CompiledLexicon(name={self.name!r}, version={self.version!r}, fingerprint={self.fingerprint[:12]!r})"
+    
+    def state(self):
+        """Return the rule set as plain lists and dicts"""
+        return lexicon_state({
+            "positive_words": self.positive_words,
+            "negative_words": self.negative_words,
+            "category_keywords": self.category_keywords,
+            "category_priority": self.category_priority,
+            "recommendations": self.recommendations,
+            "word_boundaries": self.word_boundaries
+        })
+
+
+@lru_cache(maxsize=None)
+def default_lexicon():
+    """Return the shared compiled form of DEFAULT_LEXICON"""
+    return CompiledLexicon(DEFAULT_LEXICON, name="default", version=1)
+
+
+def tracked_edit(method):
+    """Wrap a mutating container method so that calling it marks the owner's lexicon as edited"""
+    def edit(self, *args, **kwargs):
+        self.owner._lexicon_dirty = True
+        return method(self, *args, **kwargs)
+    edit.__name__ = method.__name__
+    return edit
+
+
+class LexiconList(list):
+    """Word list of one summarizer that marks its lexicon as edited on every in-place change
+    
+    Copies and pickles of the list itself are plain lists.
+    """
+    
+    __slots__ = ("owner",)
+    
+    def __init__(self, values, owner):
+        super().__init__(values)
+        self.owner = owner
+    
+    def __reduce__(self):
+        return (list, (list(self),))
+    
+    append = tracked_edit(list.append)
+    extend = tracked_edit(list.extend)
+    insert = tracked_edit(list.insert)
+    remove = tracked_edit(list.remove)
+    pop = tracked_edit(list.pop)
+    clear = tracked_edit(list.clear)
+    sort = tracked_edit(list.sort)
+    reverse = tracked_edit(list.reverse)
+    __setitem__ = tracked_edit(list.__setitem__)
+    __delitem__ = tracked_edit(list.__delitem__)
+    __iadd__ = tracked_edit(list.__iadd__)
+    __imul__ = tracked_edit(list.__imul__)
+
+
+class LexiconDict(dict):
+    """Mapping of one summarizer that marks its lexicon as edited on every change, tracking list values too
+    
+    Copies and pickles of the mapping itself are plain dicts.
+    """
+    
+    __slots__ = ("owner",)
+    
+    def __init__(self, values, owner):
+        self.owner = owner
+        super().__init__((key, track_lexicon_value(value, owner)) for key, value in values.items())
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+    
+    def __setitem__(self, key, value):
+        self.owner._lexicon_dirty = True
+        super().__setitem__(key, track_lexicon_value(value, self.owner))
+    
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    __delitem__ = tracked_edit(dict.__delitem__)
+    pop = tracked_edit(dict.pop)
+    popitem = tracked_edit(dict.popitem)
+    clear = tracked_edit(dict.clear)
+
+
+def track_lexicon_value(value, owner):
+    """Return a copy of a word list or mapping that reports its edits to `owner`; other values are returned as is"""
+    if isinstance(value, (list, tuple)):
+        return LexiconList(value, owner)
+    if isinstance(value, (dict, MappingProxyType)):
+        return LexiconDict(value, owner)
+    return value
+
+
+def content_hash(texts):
+    """Hash a conversation's message texts"""
+    digest = hashlib.sha256()
+    for text in texts:
+        encoded = text.encode("utf-8")
+        # Length-prefix each message so different splits never collide
+        digest.update(f"{len(encoded)}:".encode("ascii"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Persistent per-conversation result cache backed by SQLite
+    
+    Results are keyed by conversation_id and a hash of the conversation's
+    messages. The cache remembers the fingerprint of the lexicon it was
+    filled with and drops every stored result when a different one is bound.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "conversation_id TEXT PRIMARY KEY, content_hash TEXT NOT NULL, result TEXT NOT NULL)"
+        )
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+    
+    def bind(self, fingerprint):
+        """Invalidate all stored results if they were computed with a different lexicon"""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'lexicon'").fetchone()
+        if row is None or row[0] != fingerprint:
+            self.connection.execute("DELETE FROM results")
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('lexicon', ?)", (fingerprint,))
+            self.connection.commit()
+    
+    def get(self, conversation_id, digest):
+        """Return the cached result for a conversation, or None if it is missing or stale"""
+        row = self.connection.execute(
+            "SELECT result FROM results WHERE conversation_id = ? AND content_hash = ?",
+            (conversation_id, digest)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+    
+    def get_many(self, keys):
+        """Return cached results for (conversation_id, content hash) pairs with one query
+        
+        The returned list holds None for each key that is missing or stale.
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        ids = list({conversation_id for conversation_id, _ in keys})
+        placeholders = ", ".join("?" * len(ids))
+        rows = self.connection.execute(
+            f"SELECT conversation_id, content_hash, result FROM results WHERE conversation_id IN ({placeholders})",
+            ids
+        ).fetchall()
+        stored = {(conversation_id, digest): result for conversation_id, digest, result in rows}
+        results = []
+        for key in keys:
+            row = stored.get(key)
+            if row is None:
+                self.misses += 1
+                results.append(None)
+            else:
+                self.hits += 1
+                results.append(json.loads(row))
+        return results
+    
+    def put_many(self, entries):
+        """Store (conversation_id, content hash, result) entries"""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results (conversation_id, content_hash, result) VALUES (?, ?, ?)",
+            [(conversation_id, digest, json.dumps(result)) for conversation_id, digest, result in entries]
+        )
+        self.connection.commit()
+    
+    def stats(self):
+        """Return the hit and miss counters"""
+        return {"hits": self.hits, "misses": self.misses}
+    
+    def close(self):
+        """Close the underlying database"""
+        self.connection.close()
+
+
+class BatchAnalyzer:
+    """Columnar batch engine that computes results for many conversations at once with NumPy
+    
+    Records are loaded into flat per-message columns (conversation code, word
+    count, positive and negative keyword hits, category index) and the
+    per-conversation totals are computed with grouped reductions. Word counts
+    come from token boundaries found on one concatenated code point buffer.
+    Results match ChatLogSummarizer.analyze_results exactly.
+    """
+    
+    # Lookup table of the code points str.split() treats as whitespace
+    _whitespace = None
+    
+    def __init__(self, summarizer):
+        if np is None:
+            raise ImportError("BatchAnalyzer requires NumPy. Install it with 'pip install numpy'.")
+        self.summarizer = summarizer
+        if BatchAnalyzer._whitespace is None:
+            BatchAnalyzer._whitespace = np.array([chr(code).isspace() for code in range(MAX_WHITESPACE_CODE + 1)])
+    
+    def count_words(self, texts):
+        """Return the str.split() word count of each text as an int64 array
+        
+        The texts are joined by spaces behind a leading space into one code
+        point array, bytes for ASCII text and UTF-32 otherwise. A word starts
+        wherever a non-space follows a space, so each message's count is the
+        number of word starts inside its span of the buffer.
+        """
+        if not texts:
+            return np.zeros(0, dtype=np.int64)
+        joined = " " + " ".join(texts)
+        if joined.isascii():
+            codes = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+            space = (codes == 32) | (codes - 9 < 5) | (codes - 28 < 4)
+        else:
+            codes = np.frombuffer(joined.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+            space = (codes <= MAX_WHITESPACE_CODE) & self._whitespace[np.minimum(codes, MAX_WHITESPACE_CODE)]
+        # Buffer index of the first character of every word, less one
+        starts = np.flatnonzero(space[:-1] > space[1:])
+        
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        ends = np.cumsum(lengths + 1)
+        return np.searchsorted(starts, ends - 1) - np.searchsorted(starts, ends - lengths - 1)
+    
+    def load(self, conversations):
+        """Build the per-message columns for grouped conversations"""
+        matcher = self.summarizer.get_matcher()
+        other_index = len(matcher.categories)
+        
+        conversation_ids = list(conversations)
+        sizes = np.fromiter(map(len, conversations.values()), dtype=np.int64, count=len(conversation_ids))
+        texts = []
+        positive = []
+        negative = []
+        categories = []
+        
+        # Sentiment words may span two messages of a conversation, so each conversation is scanned on its own
+        for messages in conversations.values():
+            conversation_texts = [msg["message"] for msg in messages]
+            positive_hits, negative_hits, category_indexes = matcher.scan([text.lower() for text in conversation_texts])
+            texts.extend(conversation_texts)
+            positive.extend(positive_hits)
+            negative.extend(negative_hits)
+            categories.extend(category_indexes)
+        
+        category_codes = np.array(categories, dtype=np.int64)
+        category_codes[category_codes < 0] = other_index
+        return {
+            "conversation_ids": conversation_ids,
+            "offsets": np.cumsum(sizes) - sizes,
+            "codes": np.repeat(np.arange(len(conversation_ids), dtype=np.int64), sizes),
+            "word_counts": self.count_words(texts),
+            "positive_hits": np.array(positive, dtype=np.int64),
+            "negative_hits": np.array(negative, dtype=np.int64),
+            "category_codes": category_codes
+        }
+    
+    def analyze(self, conversations):
+        """Analyze grouped conversations, returning one result per conversation in input order"""
+        columns = self.load(conversations)
+        conversation_ids = columns["conversation_ids"]
+        if not conversation_ids:
+            return []
+        
+        summarizer = self.summarizer
+        matcher = summarizer.get_matcher()
+        category_names = matcher.categories + ["Other"]
+        count = len(conversation_ids)
+        offsets = columns["offsets"]
+        
+        # Grouped reductions over the message columns
+        total_messages = np.bincount(columns["codes"], minlength=count)
+        total_words = np.add.reduceat(columns["word_counts"], offsets)
+        positive_counts = np.add.reduceat(columns["positive_hits"], offsets)
+        negative_counts = np.add.reduceat(columns["negative_hits"], offsets)
+        category_counts = np.bincount(
+            columns["codes"] * len(category_names) + columns["category_codes"],
+            minlength=count * len(category_names)
+        ).reshape(count, len(category_names))
+        
+        # Python's round() is used on the quotients to keep its exact rounding
+        avg_words = [round(value, 2) for value in (total_words / total_messages).tolist()]
+        detailed = (np.array(avg_words) >= 20).tolist()
+        
+        # Convert back to Python scalars once, so results match the dict-based path exactly
+        total_messages = total_messages.tolist()
+        total_words = total_words.tolist()
+        positive_counts = positive_counts.tolist()
+        negative_counts = negative_counts.tolist()
+        category_counts = category_counts.tolist()
+        word_counts = columns["word_counts"].tolist()
+        bounds = offsets.tolist() + [len(word_counts)]
+        
+        results = []
+        for i, conv_id in enumerate(conversation_ids):
+            results.append({
+                "conversation_id": conv_id,
+                "word_counts": word_counts[bounds[i]:bounds[i + 1]],
+                "metrics": {
+                    "total_messages": total_messages[i],
+                    "total_words": total_words[i],
+                    "avg_words": avg_words[i],
+                    "conversation_detail": "Detailed" if detailed[i] else "Brief"
+                },
+                "sentiment": summarizer.sentiment_from_counts(positive_counts[i], negative_counts[i]),
+                "categorization": summarizer.categorization_from_counts(dict(zip(category_names, category_counts[i])))
+            })
+        return results
+
+
+def structured_record(result):
+    """Flatten an analysis result into one compact record for machine consumption"""
+    metrics = result["metrics"]
+    sentiment = result["sentiment"]
+    categorization = result["categorization"]
+    
+    return {
+        "conversation_id": result["conversation_id"],
+        "total_messages": metrics["total_messages"],
+        "total_words": metrics["total_words"],
+        "avg_words": metrics["avg_words"],
+        "conversation_detail": metrics["conversation_detail"],
+        "positive_count": sentiment["positive_count"],
+        "negative_count": sentiment["negative_count"],
+        "sentiment_score": sentiment["sentiment_score"],
+        "sentiment_category": sentiment["sentiment_category"],
+        "category_counts": dict(categorization["category_counts"]),
+        "dominant_category": categorization["dominant_category"]
+    }
+
+
+def write_jsonl(records, sink):
+    """Write structured records to a text sink as JSON Lines, returning the record count"""
+    count = 0
+    for record in records:
+        sink.write(json.dumps(record, ensure_ascii=False))
+        sink.write("\n")
+        count += 1
+    return count
+
+
+def flatten_record(record, prefix=""):
+    """Flatten nested dicts into dotted column names"""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+class ColumnarWriter:
+    """Write structured records column by column
+    
+    Uses Parquet (for `.parquet` paths) or the Arrow IPC file format when
+    pyarrow is installed. Without pyarrow it writes a JSON stand-in of the
+    form {"num_rows": n, "columns": {name: [values, ...]}}. Nested category
+    counts become dotted columns such as "category_counts.Complaint".
+    """
+    
+    def __init__(self, path, row_group_size=65536):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.columns = {}
+        self.num_rows = 0
+        self._buffered = 0
+        self._writer = None
+        self._schema = None
+    
+    def write(self, record):
+        """Append one structured record"""
+        flat = flatten_record(record)
+        for name in flat:
+            if name not in self.columns:
+                # A column that first appears late is padded with nulls
+                self.columns[name] = [None] * self._buffered
+        for name, values in self.columns.items():
+            values.append(flat.get(name))
+        self.num_rows += 1
+        self._buffered += 1
+        
+        if pa is not None and self._buffered >= self.row_group_size:
+            self._flush_arrow()
+    
+    def write_all(self, records):
+        """Append every record from an iterable, returning the total row count"""
+        for record in records:
+            self.write(record)
+        return self.num_rows
+    
+    def _flush_arrow(self):
+        """Write the buffered rows as one Arrow record batch or Parquet row group"""
+        if self._writer is None:
+            table = pa.table(self.columns)
+            self._schema = table.schema
+            if str(self.path).endswith(".parquet"):
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, table.schema)
+        else:
+            # Later row groups reuse the schema inferred from the first one
+            table = pa.table(self.columns, schema=self._schema)
+        self._writer.write_table(table)
+        self.columns = {name: [] for name in self.columns}
+        self._buffered = 0
+    
+    def close(self):
+        """Flush the remaining rows and finish the file"""
+        if pa is not None:
+            if self._buffered or self._writer is None:
+                self._flush_arrow()
+            self._writer.close()
+            return
+        
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"num_rows": self.num_rows, "columns": self.columns}, f, ensure_ascii=False)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_columnar(records, path):
+    """Write structured records to a columnar file, returning the row count"""
+    with ColumnarWriter(path) as writer:
+        return writer.write_all(records)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_timestamp(value):
+    """Parse an export timestamp into epoch seconds, or None if it is not recognized
+    
+    ISO 8601 values are tried first, then the day-first TIMESTAMP_FORMATS.
+    Naive timestamps are taken as UTC. Results are cached per distinct
+    string, since exports repeat the same timestamps across many records.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = None
+        for timestamp_format in TIMESTAMP_FORMATS:
+            try:
+                parsed = datetime.strptime(value, timestamp_format)
+                break
+            except ValueError:
+                continue
+        if parsed is None:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def to_epoch(value):
+    """Convert epoch seconds, a datetime or a timestamp string to epoch seconds"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, str):
+        epoch = parse_timestamp(value)
+        if epoch is None:
+            raise ValueError(f"Unrecognized timestamp: {value!r}")
+        return epoch
+    return int(value)
+
+
+class TimeWindowIndex:
+    """Incremental time-bucketed aggregates of conversation sentiment and categories
+    
+    Each message's sentiment hits and category are counted in the hour or
+    day bucket of its own timestamp, and each conversation is counted once
+    in the bucket of its earliest message. Buckets are kept sorted alongside
+    running prefix sums, so the totals for any time range are one bisect and
+    one subtraction away. Rows added in time order update the prefix sums in
+    place; out-of-order additions mark them for a rebuild on the next query.
+    """
+    
+    def __init__(self, categories, granularity=WINDOW_DAY):
+        if granularity not in WINDOW_SECONDS:
+            raise ValueError(f"Unsupported window granularity: {granularity}")
+        self.granularity = granularity
+        self.bucket_seconds = WINDOW_SECONDS[granularity]
+        self.categories = list(categories)
+        self._columns = {category: i + 3 for i, category in enumerate(self.categories)}
+        self._width = len(self.categories) + 3
+        self._buckets = []
+        self._totals = {}
+        self._prefix = [[0] * self._width]
+        self._dirty = False
+        self.unparsed = 0
+    
+    def __len__(self):
+        return len(self._buckets)
+    
+    def add_conversation(self, messages, positive_hits, negative_hits, categories):
+        """Add a conversation's per-message hits and category names, returning False if none of its timestamps parse
+        
+        A message whose timestamp does not parse is counted at the
+        conversation's earliest timestamp.
+        """
+        epochs = [parse_timestamp(msg["timestamp"]) for msg in messages]
+        parsed = [epoch for epoch in epochs if epoch is not None]
+        if not parsed:
+            self.unparsed += 1
+            return False
+        first = min(parsed)
+        
+        # Sum the messages per bucket first, so each bucket is updated once
+        rows = {first // self.bucket_seconds: [0] * self._width}
+        rows[first // self.bucket_seconds][0] = 1
+        for epoch, positive, negative, category in zip(epochs, positive_hits, negative_hits, categories):
+            bucket = (first if epoch is None else epoch) // self.bucket_seconds
+            row = rows.get(bucket)
+            if row is None:
+                row = rows[bucket] = [0] * self._width
+            row[1] += 1
+            row[2] += positive - negative
+            row[self._columns[category]] += 1
+        for bucket, row in rows.items():
+            self.add(bucket * self.bucket_seconds, row)
+        return True
+    
+    def add(self, epoch, row):
+        """Add a row of [conversations, messages, sentiment_score, *category counts] at `epoch`"""
+        bucket = epoch // self.bucket_seconds
+        totals = self._totals.get(bucket)
+        if totals is None:
+            totals = self._totals[bucket] = [0] * self._width
+            if self._buckets and bucket < self._buckets[-1]:
+                insort(self._buckets, bucket)
+                self._dirty = True
+            else:
+                self._buckets.append(bucket)
+                self._prefix.append(list(self._prefix[-1]))
+        elif bucket != self._buckets[-1]:
+            self._dirty = True
+        
+        for i, value in enumerate(row):
+            totals[i] += value
+        if not self._dirty:
+            last = self._prefix[-1]
+            for i, value in enumerate(row):
+                last[i] += value
+    
+    def _rebuild(self):
+        prefix = [[0] * self._width]
+        for bucket in self._buckets:
+            prefix.append([a + b for a, b in zip(prefix[-1], self._totals[bucket])])
+        self._prefix = prefix
+        self._dirty = False
+    
+    def _range_totals(self, start_bucket, end_bucket):
+        if self._dirty:
+            self._rebuild()
+        lo = bisect_left(self._buckets, start_bucket)
+        hi = bisect_left(self._buckets, end_bucket)
+        return [b - a for a, b in zip(self._prefix[lo], self._prefix[hi])]
+    
+    def _window(self, start_bucket, end_bucket):
+        totals = self._range_totals(start_bucket, end_bucket)
+        conversations, messages, sentiment_score = totals[:3]
+        return {
+            "start": datetime.fromtimestamp(start_bucket * self.bucket_seconds, timezone.utc).isoformat(),
+            "end": datetime.fromtimestamp(end_bucket * self.bucket_seconds, timezone.utc).isoformat(),
+            "conversations": conversations,
+            "messages": messages,
+            "sentiment_score": sentiment_score,
+            "average_sentiment": round(sentiment_score / messages, 2) if messages > 0 else 0,
+            "category_counts": dict(zip(self.categories, totals[3:]))
+        }
+    
+    def window(self, start, end):
+        """Return the totals for [start, end), at bucket resolution
+        
+        `conversations` counts the conversations starting in the window, and
+        the message, sentiment and category totals cover the messages sent in
+        it. `start` and `end` may be epoch seconds, datetimes or timestamp
+        strings.
+        """
+        return self._window(to_epoch(start) // self.bucket_seconds, -(-to_epoch(end) // self.bucket_seconds))
+    
+    def sliding(self, size=1, step=1):
+        """Yield windows of `size` buckets, advancing `step` buckets at a time over the indexed range"""
+        if size < 1 or step < 1:
+            raise ValueError("Window size and step must be at least 1")
+        if not self._buckets:
+            return
+        first, last = self._buckets[0], self._buckets[-1]
+        for start_bucket in range(first, last + 1, step):
+            yield self._window(start_bucket, start_bucket + size)
+    
+    def tumbling(self, size=1):
+        """Yield consecutive non-overlapping windows of `size` buckets, aligned to multiples of `size`"""
+        if size < 1:
+            raise ValueError("Window size must be at least 1")
+        if not self._buckets:
+            return
+        first, last = self._buckets[0] // size * size, self._buckets[-1]
+        for start_bucket in range(first, last + 1, size):
+            yield self._window(start_bucket, start_bucket + size)
+
+
+class StageMetrics:
+    """Per-stage instrumentation for ChatLogSummarizer
+    
+    Records wall time, CPU time, records processed and bytes in/out for each
+    stage, keeps the slowest conversations in a bounded heap, and exports
+    everything as JSON or Prometheus text. Hooks are called as
+    `hook(stage, event)` after every recorded stage event. Byte counts for
+    text input are measured in characters.
+    """
+    
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self.hooks = []
+        self.reset()
+    
+    def reset(self):
+        """Clear all recorded measurements"""
+        self.stages = {}
+        self._slowest = []
+        self._sequence = 0
+    
+    def add_hook(self, hook):
+        """Register a callable invoked as hook(stage, event) after each stage event"""
+        self.hooks.append(hook)
+    
+    def start(self):
+        """Return the wall and CPU clock readings that mark the start of a stage"""
+        return time.perf_counter(), time.process_time()
+    
+    def finish(self, stage, started, records=0, bytes_in=0, bytes_out=0):
+        """Record a stage event that began at `started`"""
+        event = {
+            "wall_seconds": time.perf_counter() - started[0],
+            "cpu_seconds": time.process_time() - started[1],
+            "records": records,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out
+        }
+        return self.record(stage, event)
+    
+    def record(self, stage, event):
+        """Add a finished stage event, such as one measured in a worker process"""
+        totals = self.stages.get(stage)
+        if totals is None:
+            totals = self.stages[stage] = {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "records": 0, "bytes_in": 0, "bytes_out": 0}
+        totals["calls"] += 1
+        for key, value in event.items():
+            totals[key] += value
+        
+        for hook in self.hooks:
+            hook(stage, event)
+        return event
+    
+    def record_conversation(self, conversation_id, seconds):
+        """Track a conversation's analysis time, keeping only the slowest `top_n`"""
+        self._sequence += 1
+        entry = (seconds, -self._sequence, conversation_id)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+    
+    def merge(self, events, conversations):
+        """Add (stage, event) pairs and (conversation_id, seconds) timings recorded elsewhere"""
+        for stage, event in events:
+            self.record(stage, event)
+        for conversation_id, seconds in conversations:
+            self.record_conversation(conversation_id, seconds)
+    
+    def slowest_conversations(self):
+        """Return the slowest conversations as (conversation_id, seconds), slowest first"""
+        return [(conversation_id, seconds) for seconds, _, conversation_id in sorted(self._slowest, reverse=True)]
+    
+    def to_dict(self):
+        """Return all measurements as a plain dict"""
+        return {
+            "stages": {stage: dict(totals) for stage, totals in self.stages.items()},
+            "slowest_conversations": [
+                {"conversation_id": conversation_id, "seconds": seconds}
+                for conversation_id, seconds in self.slowest_conversations()
+            ]
+        }
+    
+    def to_json(self, indent=None):
+        """Export all measurements as JSON"""
+        return json.dumps(self.to_dict(), indent=indent)
+    
+    def to_prometheus(self, prefix="chatlog"):
+        """Export all measurements in the Prometheus text exposition format"""
+        metrics = [
+            ("calls", "counter", "Number of times each stage ran"),
+            ("wall_seconds", "counter", "Wall-clock time spent in each stage"),
+            ("cpu_seconds", "counter", "CPU time spent in each stage"),
+            ("records", "counter", "Records processed by each stage"),
+            ("bytes_in", "counter", "Bytes read by each stage"),
+            ("bytes_out", "counter", "Bytes written by each stage")
+        ]
+        
+        lines = []
+        for key, metric_type, description in metrics:
+            name = f"{prefix}_stage_{key}_total"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for stage, totals in self.stages.items():
+                lines.append(f'{name}{{stage="{prometheus_label(stage)}"}} {totals[key]}')
+        
+        name = f"{prefix}_slowest_conversation_seconds"
+        lines.append(f"# HELP {name} Analysis time of the slowest conversations")
+        lines.append(f"# TYPE {name} gauge")
+        for conversation_id, seconds in self.slowest_conversations():
+            lines.append(f'{name}{{conversation_id="{prometheus_label(conversation_id)}"}} {seconds}')
+        
+        return "\n".join(lines) + "\n"
+
+
+def prometheus_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class ChatLogSummarizer:
+    def __setattr__(self, name, value):
+        # Word lists are stored as copies that mark this summarizer's lexicon as edited
+        if name in LEXICON_ATTRIBUTES:
+            value = track_lexicon_value(value, self)
+            object.__setattr__(self, "_lexicon_dirty", True)
+        object.__setattr__(self, name, value)
+    
+    def __setstate__(self, state):
+        # Copies and pickles hold plain word lists, so wrap them again
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lexicon_dirty = True
+    
+    def __init__(self, word_boundaries=None, cache=None, metrics=None, memory_limit=None, temp_dir=None, lexicon=None):
+        # Start from a compiled lexicon shared with every summarizer that uses it
+        lexicon = lexicon or default_lexicon()
+        
+        # Define word lists for sentiment analysis; assignment stores editable copies
+        self.positive_words = lexicon.positive_words
+        self.negative_words = lexicon.negative_words
+        
+        # Define category keywords
+        self.category_keywords = lexicon.category_keywords
+        
+        # Category priority order for ties, and the recommendation for each category
+        self.category_priority = lexicon.category_priority
+        self.recommendations = lexicon.recommendations
+        
+        # Whole-word matching follows the lexicon unless set explicitly
+        self.word_boundaries = lexicon.word_boundaries if word_boundaries is None else word_boundaries
+        self.cache = cache
+        self.metrics = metrics
+        
+        # Memory ceiling in bytes for grouping unordered streamed input; None keeps every conversation in memory
+        self.memory_limit = memory_limit
+        self.temp_dir = temp_dir
+        
+        # Word lists edited after construction are recompiled on next use; the
+        # copies above match the lexicon unless word_boundaries overrides it
+        self._lexicon = lexicon
+        self._lexicon_state = None
+        self._lexicon_dirty = self.word_boundaries != lexicon.word_boundaries
+        self.get_lexicon()
+    
+    def get_lexicon(self):
+        """Return the compiled lexicon, recompiling it if the word lists or settings changed"""
+        # Comparing the word lists costs time proportional to their size, so
+        # only do it after this summarizer's word lists were edited or replaced
+        if not self._lexicon_dirty:
+            return self._lexicon
+        self._lexicon_dirty = False
+        state = self._lexicon_state
+        if state is None:
+            state = self._lexicon_state = self._lexicon.state()
+        if (state["positive_words"] != self.positive_words
+                or state["negative_words"] != self.negative_words
+                or state["category_keywords"] != self.category_keywords
+                or list(state["category_keywords"]) != list(self.category_keywords)
+                or state["category_priority"] != self.category_priority
+                or state["recommendations"] != self.recommendations
+                or state["word_boundaries"] != self.word_boundaries):
+            self._lexicon = CompiledLexicon(self.get_lexicon_state())
+            self._lexicon_state = self._lexicon.state()
+        return self._lexicon
+    
+    def get_matcher(self):
+        """Return the compiled keyword matcher for the current word lists"""
+        return self.get_lexicon().matcher
+    
+    def scan_messages(self, messages, matcher=None):
+        """Run the keyword matcher once over a conversation's lowercased messages"""
+        matcher = matcher or self.get_matcher()
+        return matcher.scan([msg["message"].lower() for msg in messages])
+    
+    def get_lexicon_state(self):
+        """Return the word lists and settings needed to rebuild this summarizer elsewhere"""
+        return {
+            "positive_words": list(self.positive_words),
+            "negative_words": list(self.negative_words),
+            "category_keywords": {category: list(keywords) for category, keywords in self.category_keywords.items()},
+            "category_priority": list(self.category_priority),
+            "recommendations": dict(self.recommendations),
+            "word_boundaries": self.word_boundaries
+        }
+    
+    def lexicon_fingerprint(self):
+        """Hash every setting that affects analysis results"""
+        return self.get_lexicon().fingerprint
+    
+    @classmethod
+    def from_lexicon_state(cls, state):
+        """Create a summarizer from the output of get_lexicon_state"""
+        return cls(lexicon=CompiledLexicon(state))
+    
+    def parse_input(self, data_input, format_type):
+        """Parse and validate input data
+        
+        CSV input may also be a bytes-like object, such as an mmap, which is
+        scanned without decoding it into one string first.
+        """
+        if self.metrics is not None:
+            started = self.metrics.start()
+            records, errors = self._parse_input(data_input, format_type)
+            self.metrics.finish("parse_input", started, records=len(records), bytes_in=len(data_input))
+            return records, errors
+        return self._parse_input(data_input, format_type)
+    
+    def parse_file(self, path, format_type):
+        """Parse and validate an export file, memory-mapping CSV files instead of reading them into a string"""
+        with open(path, "rb") as f:
+            if format_type != "csv" or os.fstat(f.fileno()).st_size == 0:
+                data = f.read()
+                return self.parse_input(data.decode("utf-8-sig") if format_type == "csv" else data, format_type)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self.parse_input(data, format_type)
+    
+    def _parse_input(self, data_input, format_type):
+        """Parse and validate input data without instrumentation"""
+        records = []
+        errors = []
+        
+        try:
+            if format_type == "csv":
+                records = None
+                if not isinstance(data_input, str):
+                    records = scan_csv_buffer(data_input)
+                    if records is None:
+                        data_input = codecs.decode(data_input, "utf-8-sig")
+                elif not data_input.startswith("\ufeff"):
+                    try:
+                        records = scan_csv_buffer(data_input.encode("utf-8"))
+                    except UnicodeEncodeError:
+                        records = None
+                if records is None:
+                    csv_reader = csv.DictReader(StringIO(data_input))
+                    records = [Message.from_mapping(row) for row in csv_reader]
+            elif format_type == "json":
+                data = json.loads(data_input, object_pairs_hook=json_record_pairs)
+                records = data.get("conversations", [])
+            else:
+                return [], ["ERROR: Invalid data format. Please provide data in CSV or JSON format."]
+        except Exception as e:
+            return [], [f"ERROR: Failed to parse input data. {str(e)}"]
+        
+        # Validate records, replacing JSON objects with compact messages as we go
+        for i, record in enumerate(records):
+            errors.extend(self.validate_record(record, i + 1))
+            if isinstance(record, dict):
+                records[i] = Message.from_mapping(record)
+        
+        return records, errors
+    
+    def validate_record(self, record, row):
+        """Validate a single record and return its error messages"""
+        # Complete messages, the common case, skip the per-field checks
+        if type(record) is Message and record.conversation_id and record.sender and record.timestamp and record.message:
+            return []
+        
+        errors = []
+        
+        # Check for required fields
+        missing_fields = []
+        for field in REQUIRED_FIELDS:
+            if field not in record or not record[field]:
+                if field == "message":
+                    errors.append(f"ERROR: 'message' field cannot be empty in row {row}.")
+                else:
+                    missing_fields.append(field)
+        
+        if missing_fields:
+            errors.append(f"ERROR: Missing required field(s): {', '.join(missing_fields)} in row {row}.")
+        
+        return errors
+    
+    def validate_data(self, records):
+        """Generate data validation report"""
+        if self.metrics is not None:
+            started = self.metrics.start()
+        
+        # Group records by conversation_id; the records are already in memory,
+        # so grouping only adds references and never needs to spill
+        conversations = {}
+        for record in records:
+            conversation_id = record["conversation_id"]
+            if conversation_id not in conversations:
+                conversations[conversation_id] = []
+            conversations[conversation_id].append(record)
+        
+        validation_report = "".join(self.iter_validation_report(len(conversations)))
+        
+        if self.metrics is not None:
+            self.metrics.finish("validate_data", started, records=len(records), bytes_out=len(validation_report))
+        
+        return validation_report, conversations
+    
+    def calculate_conversation_metrics(self, messages):
+        """Calculate metrics for a conversation"""
+        if self.metrics is not None:
+            started = self.metrics.start()
+            metrics = self.metrics_from_word_counts([len(msg["message"].split()) for msg in messages])
+            self.metrics.finish("calculate_conversation_metrics", started, records=len(messages))
+            return metrics
+        return self.metrics_from_word_counts([len(msg["message"].split()) for msg in messages])
+    
+    def metrics_from_word_counts(self, word_counts):
+        """Build the conversation metrics from each message's word count"""
+        return self.metrics_from_totals(len(word_counts), sum(word_counts))
+    
+    def metrics_from_totals(self, total_messages, total_words):
+        """Build the conversation metrics from message and word totals"""
+        avg_words = round(total_words / total_messages, 2) if total_messages > 0 else 0
+        conversation_detail = "Detailed" if avg_words >= 20 else "Brief"
+        
+        return {
+            "total_messages": total_messages,
+            "total_words": total_words,
+            "avg_words": avg_words,
+            "conversation_detail": conversation_detail
+        }
+    
+    def calculate_sentiment(self, messages):
+        """Calculate sentiment scores for a conversation"""
+        if self.metrics is not None:
+            started = self.metrics.start()
+        positive_hits, negative_hits, _ = self.scan_messages(messages)
+        sentiment = self.sentiment_from_counts(sum(positive_hits), sum(negative_hits))
+        if self.metrics is not None:
+            self.metrics.finish("calculate_sentiment", started, records=len(messages))
+        return sentiment
+    
+    def sentiment_from_counts(self, positive_count, negative_count):
+        """Build the sentiment result from positive and negative word counts"""
+        sentiment_score = positive_count - negative_count
+        
+        if sentiment_score > 0:
+            sentiment_category = "Positive"
+        elif sentiment_score < 0:
+            sentiment_category = "Negative"
+        else:
+            sentiment_category = "Neutral"
+        
+        return {
+            "positive_count": positive_count,
+            "negative_count": negative_count,
+            "sentiment_score": sentiment_score,
+            "sentiment_category": sentiment_category
+        }
+    
+    def categorize_chat(self, messages):
+        """Categorize chat based on keywords"""
+        if self.metrics is not None:
+            started = self.metrics.start()
+        _, _, message_categories = self.scan_messages(messages)
+        categorization = self.categorization_from_matches(message_categories)
+        if self.metrics is not None:
+            self.metrics.finish("categorize_chat", started, records=len(messages))
+        return categorization
+    
+    def categorization_from_matches(self, message_categories, matcher=None):
+        """Build the categorization result from each message's matched category index"""
+        matcher = matcher or self.get_matcher()
+        categories = {cat: 0 for cat in matcher.categories + ["Other"]}
+        
+        for index in message_categories:
+            if index >= 0:
+                categories[matcher.categories[index]] += 1
+            else:
+                categories["Other"] += 1
+        
+        return self.categorization_from_counts(categories)
+    
+    def categorization_from_counts(self, categories):
+        """Build the categorization result from per-category message counts"""
+        # Determine dominant category
+        max_count = max(categories.values())
+        dominant_categories = [cat for cat, count in categories.items() if count == max_count]
+        
+        if len(dominant_categories) == 1:
+            dominant_category = dominant_categories[0]
+        else:
+            # Use priority order for tie-breaking
+            for category in self.category_priority:
+                if category in dominant_categories:
+                    dominant_category = category
+                    break
+        
+        return {
+            "category_counts": categories,
+            "dominant_category": dominant_category,
+            "recommendation": self.recommendations[dominant_category]
+        }
+    
+    def analyze_results(self, conversations, workers=None):
+        """Analyze all conversations, returning one result per conversation in input order"""
+        return list(self.iter_results(conversations, workers))
+    
+    def analyze_batch(self, conversations):
+        """Analyze all conversations with the columnar NumPy engine"""
+        return BatchAnalyzer(self).analyze(conversations)
+    
+    def iter_results(self, conversations, workers=None):
+        """Yield one result per conversation, in input order, as soon as it is available
+        
+        With `workers` greater than one the conversations are sharded across a
+        process pool; only the conversation ids and message texts are sent to
+        the workers, and results are merged back in the original order.
+        When a result cache is set, only new or changed conversations are analyzed.
+        """
+        items = ((conv_id, tuple(msg["message"] for msg in messages)) for conv_id, messages in conversations.items())
+        shard_size = max(1, min(MAX_SHARD_SIZE, -(-len(conversations) // ((workers or 1) * SHARDS_PER_WORKER))))
+        yield from self._iter_item_results(items, workers, shard_size)
+    
+    def _iter_item_results(self, items, workers=None, shard_size=1):
+        """Yield one result per (conversation_id, message texts) pair, going through the result cache if set"""
+        if self.cache is None:
+            yield from self._iter_analyzed(items, workers, shard_size)
+            return
+        
+        # Look up conversations in batches and analyze only the misses, on one pool started at the first miss
+        self.cache.bind(self.lexicon_fingerprint())
+        executor = None
+        try:
+            for batch in iter_batches(items, CACHE_BATCH_SIZE):
+                keys = [(conv_id, content_hash(texts)) for conv_id, texts in batch]
+                results = self.cache.get_many(keys)
+                pending = [i for i, result in enumerate(results) if result is None]
+                digests = [keys[i][1] for i in pending]
+                
+                if pending and executor is None and workers and workers > 1:
+                    executor = self._start_pool(workers)
+                computed = list(self._iter_analyzed([batch[i] for i in pending], workers, shard_size, executor))
+                for i, result in zip(pending, computed):
+                    results[i] = result
+                self.cache.put_many(
+                    (result["conversation_id"], digest, result) for result, digest in zip(computed, digests)
+                )
+                
+                yield from results
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _start_pool(self, workers):
+        """Start a process pool whose workers each hold this summarizer's compiled lexicon
+        
+        When this summarizer has metrics, the workers time their stages too and
+        send the measurements back with each shard's results.
+        """
+        return ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self.get_lexicon(), self.metrics is not None)
+        )
+    
+    def _iter_analyzed(self, items, workers, shard_size, executor=None):
+        """Analyze (conversation_id, message texts) pairs serially or on a process pool
+        
+        A pool is started for the call unless a running `executor` is given.
+        """
+        if not workers or workers <= 1:
+            for conv_id, texts in items:
+                yield self.analyze_texts(conv_id, texts)
+            return
+        
+        if executor is None:
+            with self._start_pool(workers) as executor:
+                yield from self._iter_analyzed(items, workers, shard_size, executor)
+            return
+        
+        # Keep a bounded number of shards in flight so results stream back in order
+        in_flight = deque()
+        for shard in iter_batches(items, shard_size):
+            in_flight.append(executor.submit(_analyze_shard, shard))
+            if len(in_flight) >= workers * SHARDS_PER_WORKER:
+                yield from self._shard_results(in_flight.popleft())
+        while in_flight:
+            yield from self._shard_results(in_flight.popleft())
+    
+    def _shard_results(self, future):
+        """Return a worker shard's results, merging the worker's measurements into this summarizer's metrics"""
+        results, measurements = future.result()
+        if measurements is not None and self.metrics is not None:
+            self.metrics.merge(*measurements)
+        return results
+    
+    def time_windows(self, conversations, granularity=WINDOW_DAY):
+        """Build a TimeWindowIndex over conversations for windowed sentiment and category queries"""
+        matcher = self.get_matcher()
+        names = matcher.categories + ["Other"]
+        index = TimeWindowIndex(self.category_priority, granularity)
+        for messages in conversations.values():
+            positive_hits, negative_hits, categories = matcher.scan([msg["message"].lower() for msg in messages])
+            index.add_conversation(messages, positive_hits, negative_hits, [names[category] for category in categories])
+        return index
+    
+    def iter_validation_report(self, conversation_count):
+        """Yield the data validation report"""
+        validation_report = "# Data Validation Report\n"
+        validation_report += "## 1. Data Structure Check:\n"
+        validation_report += f"- Total conversations processed: {conversation_count}\n"
+        validation_report += f"- Total fields per record: 4\n\n"
+        
+        validation_report += "## 2. Required Fields Check:\n"
+        validation_report += "- conversation_id: present\n"
+        validation_report += "- sender: present\n"
+        validation_report += "- timestamp: present\n"
+        validation_report += "- message: present\n\n"
+        
+        validation_report += "## 3. Data Content Validation:\n"
+        validation_report += "- \"message\" field not empty: validated\n\n"
+        
+        validation_report += "Validation Summary:\n"
+        validation_report += "Data validation is successful! Proceeding with analysis...\n\n"
+        
+        yield validation_report
+    
+    def analyze_conversations(self, conversations, workers=None, verbosity=VERBOSITY_FULL):
+        """Analyze all conversations and generate report"""
+        return "".join(self.iter_analysis_report(conversations, workers, verbosity))
+    
+    def iter_analysis_report(self, conversations, workers=None, verbosity=VERBOSITY_FULL):
+        """Yield the analysis report one conversation at a time as each is analyzed"""
+        yield from self.render_analysis_report(self.iter_results(conversations, workers), len(conversations), verbosity)
+    
+    def render_analysis_report(self, results, conversation_count, verbosity=VERBOSITY_FULL):
+        """Yield the analysis report for already computed results"""
+        formulas_section = "# Formulas Used:\n"
+        formulas_section += "1. Average Words per Message:\n"
+        formulas_section += "   $$ \\text{Average Words} = \\frac{\\text{Total Words}}{\\text{Total Messages}} $$\n"
+        formulas_section += "2. Sentiment Score:\n"
+        formulas_section += "   $$ \\text{Sentiment Score} = \\text{(Count of Positive Words)} - \\text{(Count of Negative Words)} $$\n\n"
+        yield formulas_section
+        
+        summary_section = "# Conversation Analysis Summary:\n"
+        summary_section += f"- Total Conversations Evaluated: {conversation_count}\n\n"
+        yield summary_section
+        
+        yield "# Detailed Analysis for Each Conversation:\n"
+        
+        metrics = self.metrics
+        for result in results:
+            if metrics is None:
+                yield self.render_conversation(result, verbosity)
+            else:
+                started = metrics.start()
+                section = self.render_conversation(result, verbosity)
+                metrics.finish("render_report", started, records=1, bytes_out=len(section))
+                yield section
+        
+        feedback_request = "# Feedback Request\n\n"
+        feedback_request += "Would you like detailed calculations for any specific conversation? Please rate this analysis on a scale of 1-5.\n"
+        yield feedback_request
+    
+    def render_conversation(self, result, verbosity=VERBOSITY_FULL):
+        """Render the detailed Markdown section for one analyzed conversation"""
+        conv_id = result["conversation_id"]
+        metrics = result["metrics"]
+        sentiment = result["sentiment"]
+        categorization = result["categorization"]
+        
+        section = []
+        section.append(f"## Conversation ID: {conv_id}\n\n")
+        
+        # Input Data Summary
+        section.append("### Input Data Summary:\n")
+        section.append(f"- Total Messages: {metrics['total_messages']}\n")
+        section.append(f"- Total Words: {metrics['total_words']}\n")
+        section.append(f"- Average Words per Message: {metrics['avg_words']} words\n\n")
+        
+        # Step-by-Step Calculations
+        section.append("### Step-by-Step Calculations:\n")
+        section.append("1. **Calculate Total Messages:**\n")
+        section.append(f"   - Count of messages in conversation: {metrics['total_messages']}\n\n")
+        
+        section.append("2. **Calculate Total Words:**\n")
+        if verbosity != VERBOSITY_SUMMARY:
+            section.append("   - Words from each message:\n")
+            for i, word_count in enumerate(result["word_counts"]):
+                section.append(f"     - Message {i+1}: {word_count} words\n")
+        section.append(f"   - Sum of all word counts: {metrics['total_words']} words\n\n")
+        
+        section.append("3. **Calculate the Average Words per Message:**\n")
+        section.append(f"   - Average Words = Total Words / Total Messages\n")
+        section.append(f"   - Average Words = {metrics['total_words']} / {metrics['total_messages']} = {metrics['avg_words']} words\n\n")
+        
+        section.append("4. **Determine Conversation Detail Level:**\n")
+        section.append(f"   - IF Average Words ({metrics['avg_words']}) ≥ 20, THEN \"Detailed\"\n")
+        section.append(f"   - ELSE \"Brief\"\n")
+        section.append(f"   - Result: Conversation is \"{metrics['conversation_detail']}\"\n\n")
+        
+        section.append("5. **Sentiment Analysis:**\n")
+        section.append("   - Count of positive words in all messages:\n")
+        section.append(f"     - Words checked: {', '.join(self.positive_words)}\n")
+        section.append(f"     - Count: {sentiment['positive_count']}\n")
+        section.append("   - Count of negative words in all messages:\n")
+        section.append(f"     - Words checked: {', '.join(self.negative_words)}\n")
+        section.append(f"     - Count: {sentiment['negative_count']}\n")
+        section.append("   - Sentiment Score calculation:\n")
+        section.append(f"     - Sentiment Score = Positive Words Count - Negative Words Count\n")
+        section.append(f"     - Sentiment Score = {sentiment['positive_count']} - {sentiment['negative_count']} = {sentiment['sentiment_score']}\n")
+        section.append("   - Sentiment categorization:\n")
+        section.append(f"     - IF Score ({sentiment['sentiment_score']}) > 0, THEN \"Positive\"\n")
+        section.append(f"     - ELSE IF Score ({sentiment['sentiment_score']}) < 0, THEN \"Negative\"\n")
+        section.append(f"     - ELSE \"Neutral\"\n")
+        section.append(f"     - Result: Sentiment is \"{sentiment['sentiment_category']}\"\n\n")
+        
+        section.append("6. **Chat Categorization:**\n")
+        section.append("   - Keyword counts for each category:\n")
+        for category, count in categorization["category_counts"].items():
+            if category != "Other":
+                keywords = self.category_keywords[category]
+                section.append(f"     - {category}: {count} (Keywords: {', '.join(keywords)})\n")
+            else:
+                section.append(f"     - {category}: {count} (No specific keywords matched)\n")
+        
+        section.append("   - Determining dominant category:\n")
+        if len([cat for cat, count in categorization["category_counts"].items() if count == max(categorization["category_counts"].values())]) == 1:
+            section.append(f"     - Category with highest count: {categorization['dominant_category']}\n")
+        else:
+            section.append("     - Multiple categories tied with highest count\n")
+            section.append(f"     - Using priority order: Complaint > Critique > Feedback > Positive Response > Other\n")
+            section.append(f"     - Highest priority category among ties: {categorization['dominant_category']}\n")
+        
+        section.append("\n7. **Customer Service Enhancement Recommendation:**\n")
+        section.append(f"   - Based on dominant category \"{categorization['dominant_category']}\"\n")
+        section.append(f"   - Recommendation: {categorization['recommendation']}\n\n")
+        
+        # Final Summary
+        section.append("### Final Summary:\n")
+        section.append(f"- Conversation Detail: {metrics['conversation_detail']}\n")
+        section.append(f"- Sentiment Category: {sentiment['sentiment_category']}\n")
+        section.append(f"- Dominant Chat Category: {categorization['dominant_category']}\n")
+        section.append(f"- Service Recommendation: {categorization['recommendation']}\n\n")
+        
+        return "".join(section)
+    
+    def iter_report(self, conversations, workers=None, verbosity=VERBOSITY_FULL):
+        """Yield the full Markdown report for grouped conversations chunk by chunk"""
+        yield from self.iter_validation_report(len(conversations))
+        yield from self.iter_analysis_report(conversations, workers, verbosity)
+    
+    def process_data(self, data_input, format_type, workers=None, verbosity=VERBOSITY_FULL):
+        """Process input data and generate full report"""
+        output = StringIO()
+        self.write_report(data_input, format_type, output, workers, verbosity)
+        return output.getvalue()
+    
+    def write_report(self, data_input, format_type, sink, workers=None, verbosity=VERBOSITY_FULL):
+        """Process input data and write the report to a text sink as it is rendered"""
+        records, errors = self.parse_input(data_input, format_type)
+        
+        if errors:
+            sink.write("\n".join(errors))
+            return
+        
+        _, conversations = self.validate_data(records)
+        for chunk in self.iter_report(conversations, workers, verbosity):
+            sink.write(chunk)
+    
+    def write_stream_report(self, source, format_type, sink, workers=None, verbosity=VERBOSITY_FULL):
+        """Write the report for a file path or binary file object without loading it
+        
+        The input is read twice: a first pass validates every record, counts
+        the conversations for the report headers and checks whether records
+        are grouped by conversation_id. If they are, the second pass analyzes
+        and writes each conversation as soon as it is complete; otherwise the
+        records are grouped first, spilling to disk beyond `memory_limit`.
+        A stream that cannot seek, such as a pipe or socket, is first copied
+        to a temporary file in `temp_dir`.
+        """
+        if not isinstance(source, (str, bytes, os.PathLike)) and not (hasattr(source, "seekable") and source.seekable()):
+            with tempfile.TemporaryFile(dir=self.temp_dir) as copy:
+                shutil.copyfileobj(source, copy, STREAM_CHUNK_SIZE)
+                copy.seek(0)
+                self.write_stream_report(copy, format_type, sink, workers, verbosity)
+            return
+        
+        start = None if isinstance(source, (str, bytes, os.PathLike)) else source.tell()
+        
+        # First pass: validate and count, reporting errors exactly like process_data
+        errors = []
+        seen = set()
+        current_id = None
+        clustered = True
+        try:
+            for _, message in self.iter_messages(source, format_type, errors):
+                if message.conversation_id != current_id:
+                    current_id = message.conversation_id
+                    if current_id in seen:
+                        clustered = False
+                    seen.add(current_id)
+        except ValueError as e:
+            errors = [str(e)]
+        if errors:
+            sink.write("\n".join(errors))
+            return
+        conversation_count = len(seen)
+        del seen
+        
+        # Second pass: stream conversations straight into the renderer
+        if start is not None:
+            source.seek(start)
+        if clustered:
+            conversations = StreamedConversations(self.iter_conversations(source, format_type, check_order=False), conversation_count)
+        else:
+            messages = (message for _, message in self.iter_messages(source, format_type))
+            conversations = group_records(messages, self.memory_limit, self.temp_dir)
+        try:
+            for chunk in self.iter_report(conversations, workers, verbosity):
+                sink.write(chunk)
+        finally:
+            if isinstance(conversations, SpilledConversations):
+                conversations.close()
+    
+    def iter_records(self, source, format_type):
+        """Stream raw records from a file path or binary file object"""
+        if format_type not in ("csv", "json"):
+            raise ValueError("ERROR: Invalid data format. Please provide data in CSV or JSON format.")
+        
+        with open_source(source) as stream:
+            if format_type == "csv":
+                records = iter_csv_records(stream)
+            else:
+                records = iter_json_conversations(stream)
+            
+            try:
+                yield from records
+            except Exception as e:
+                raise ValueError(f"ERROR: Failed to parse input data. {str(e)}") from e
+    
+    def iter_conversations(self, source, format_type, errors=None, check_order=True):
+        """Stream validated (conversation_id, messages) groups from a file path or binary file object
+        
+        Records must be grouped by conversation_id, so only the conversation
+        currently being read is held in memory. A conversation that reappears
+        later in the input raises ConversationOrderError, which costs one
+        remembered conversation_id per completed conversation. Input already
+        known to be grouped can pass `check_order=False` to skip that; a
+        reappearing conversation is then yielded again as a separate group.
+        Invalid records raise a ValueError, or are skipped and reported in
+        `errors` when a list is given.
+        """
+        current_id = None
+        messages = []
+        completed = set() if check_order else None
+        
+        for row, message in self.iter_messages(source, format_type, errors):
+            conversation_id = message.conversation_id
+            if conversation_id != current_id:
+                if messages:
+                    yield current_id, messages
+                    if completed is not None:
+                        completed.add(current_id)
+                if completed is not None and conversation_id in completed:
+                    raise ConversationOrderError(f"ERROR: Conversation '{conversation_id}' is not contiguous in row {row}. Streaming input must be grouped by conversation_id.")
+                current_id = conversation_id
+                messages = []
+            messages.append(message)
+        
+        if messages:
+            yield current_id, messages
+    
+    def iter_messages(self, source, format_type, errors=None):
+        """Stream validated (row number, Message) pairs from a file path or binary file object
+        
+        Invalid records raise a ValueError, or are skipped and reported in
+        `errors` when a list is given.
+        """
+        for i, record in enumerate(self.iter_records(source, format_type)):
+            record_errors = self.validate_record(record, i + 1)
+            if record_errors:
+                if errors is None:
+                    raise ValueError("\n".join(record_errors))
+                errors.extend(record_errors)
+                continue
+            yield i + 1, Message.from_mapping(record)
+    
+    def analyze_conversation(self, conversation_id, messages):
+        """Calculate metrics, sentiment and categorization for one conversation"""
+        return self.analyze_texts(conversation_id, [msg["message"] for msg in messages])
+    
+    def analyze_texts(self, conversation_id, texts):
+        """Analyze one conversation given only its message texts"""
+        if self.metrics is not None:
+            return self._analyze_texts_instrumented(conversation_id, texts)
+        
+        matcher = self.get_matcher()
+        word_counts = [len(text.split()) for text in texts]
+        positive_hits, negative_hits, message_categories = matcher.scan([text.lower() for text in texts])
+        
+        return {
+            "conversation_id": conversation_id,
+            "word_counts": word_counts,
+            "metrics": self.metrics_from_word_counts(word_counts),
+            "sentiment": self.sentiment_from_counts(sum(positive_hits), sum(negative_hits)),
+            "categorization": self.categorization_from_matches(message_categories, matcher)
+        }
+    
+    def _analyze_texts_instrumented(self, conversation_id, texts):
+        """Analyze one conversation, recording each step and the conversation's total time"""
+        metrics = self.metrics
+        matcher = self.get_matcher()
+        conversation_started = started = metrics.start()
+        
+        word_counts = [len(text.split()) for text in texts]
+        conversation_metrics = self.metrics_from_word_counts(word_counts)
+        metrics.finish("calculate_conversation_metrics", started, records=len(texts))
+        
+        started = metrics.start()
+        positive_hits, negative_hits, message_categories = matcher.scan([text.lower() for text in texts])
+        metrics.finish("keyword_scan", started, records=len(texts), bytes_in=sum(len(text) for text in texts))
+        
+        started = metrics.start()
+        sentiment = self.sentiment_from_counts(sum(positive_hits), sum(negative_hits))
+        metrics.finish("calculate_sentiment", started, records=len(texts))
+        
+        started = metrics.start()
+        categorization = self.categorization_from_matches(message_categories, matcher)
+        metrics.finish("categorize_chat", started, records=len(texts))
+        
+        metrics.record_conversation(conversation_id, time.perf_counter() - conversation_started[0])
+        return {
+            "conversation_id": conversation_id,
+            "word_counts": word_counts,
+            "metrics": conversation_metrics,
+            "sentiment": sentiment,
+            "categorization": categorization
+        }
+    
+    def process_stream(self, source, format_type, errors=None, check_order=True):
+        """Stream per-conversation results from a file path or binary file object
+        
+        Results are yielded as soon as each conversation is complete, so peak
+        memory is bounded by the largest conversation rather than the file.
+        With a result cache set, conversations are looked up and stored
+        CACHE_BATCH_SIZE at a time. Records must be grouped by
+        conversation_id; see iter_conversations for `check_order`. Use
+        write_stream_report for input that may not be grouped.
+        """
+        items = (
+            (conversation_id, tuple(msg["message"] for msg in messages))
+            for conversation_id, messages in self.iter_conversations(source, format_type, errors, check_order)
+        )
+        yield from self._iter_item_results(items)
+    
+    def follow(self, path, format_type="csv", on_change=None, ttl=None, max_conversations=10000,
+               poll_interval=1.0, stop=None, from_start=True, on_error=None):
+        """Tail a growing CSV or JSON Lines file, keeping live per-conversation summaries
+        
+        Runs until `stop()` returns True and returns the LiveSummarizer. See
+        LiveSummarizer for `on_change`, `ttl` and `max_conversations`.
+        """
+        live = LiveSummarizer(self, on_change, ttl, max_conversations)
+        for message in self.iter_followed_records(path, format_type, poll_interval, stop, from_start, on_error):
+            if message is None:
+                live.evict()
+            else:
+                live.add(message)
+        return live
+    
+    def iter_followed_records(self, path, format_type, poll_interval=1.0, stop=None, from_start=True, on_error=None):
+        """Yield validated Messages appended to a CSV or JSON Lines file, or None when caught up
+        
+        A rotated or truncated file is read again from the start, including a
+        new CSV header. Invalid lines are skipped and their errors passed to
+        `on_error(message)` when given.
+        """
+        if format_type not in ("csv", "jsonl"):
+            raise ValueError("ERROR: Invalid data format. Follow mode supports CSV or JSONL data.")
+        
+        current_generation = None
+        header_lines = 1 if format_type == "csv" else 0
+        for item in tail_lines(path, poll_interval, stop, from_start, header_lines):
+            if item is None:
+                yield None
+                continue
+            
+            generation, line = item
+            if generation != current_generation:
+                current_generation = generation
+                header = None
+                pending = []
+                row = 0
+            
+            if format_type == "jsonl":
+                if not line.strip():
+                    continue
+                row += 1
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("Expected a JSON object")
+                except ValueError as e:
+                    if on_error is not None:
+                        on_error(f"ERROR: Failed to parse line {row}. {str(e)}")
+                    continue
+            else:
+                # A quoted field may continue on the next line
+                pending.append(line)
+                text = "\n".join(pending)
+                if text.count('"') % 2:
+                    continue
+                pending = []
+                if header is None:
+                    header = next(csv.reader([text]), None)
+                    continue
+                record = next(csv.DictReader([text], fieldnames=header), None)
+                if record is None:
+                    continue
+                row += 1
+            
+            record_errors = self.validate_record(record, row)
+            if record_errors:
+                if on_error is not None:
+                    for error in record_errors:
+                        on_error(error)
+                continue
+            yield Message.from_mapping(record)
+    
+    def iter_structured(self, conversations, workers=None):
+        """Yield one compact structured record per conversation, in input order"""
+        for result in self.iter_results(conversations, workers):
+            yield structured_record(result)
+    
+    def process_structured(self, data_input, format_type, workers=None):
+        """Parse and analyze input data, returning (structured records, errors)"""
+        records, errors = self.parse_input(data_input, format_type)
+        
+        if errors:
+            return [], errors
+        
+        _, conversations = self.validate_data(records)
+        return list(self.iter_structured(conversations, workers)), []
+    
+    def greeting(self, message):
+        """Generate appropriate greeting based on user message"""
+        message_lower = message.lower()
+        
+        # Check for urgency keywords
+        if any(word in message_lower for word in ["urgent", "asap", "emergency"]):
+            return "ChatLogSummarizer-AI here! Let's quickly analyze your chat logs."
+        
+        # Extract name if provided
+        name_match = re.search(r"my name is (\w+)", message_lower)
+        if name_match:
+            name = name_match.group(1)
+            return f"Hello, {name}! I'm ChatLogSummarizer-AI, here to assist you with your chat log analysis."
+        
+        # Check for mood keywords
+        if any(word in message_lower for word in ["happy", "excited", "joyful", "great"]):
+            return "Hello! It's great to see your positive tone. I'm here to help summarize your chat logs!"
+        
+        if any(word in message_lower for word in ["sad", "down", "unhappy"]):
+            return "Hello. I'm sorry you're feeling down. Let's work together to analyze your chat logs for insights."
+        
+        if any(word in message_lower for word in ["angry", "frustrated", "mad"]):
+            return "Hello. I understand you're frustrated. Let's carefully review your chat logs for actionable insights."
+        
+        # Default greeting
+        return "Greetings! I am ChatLogSummarizer-AI, your assistant for categorizing and summarizing chat/email logs. Please share your chat log data in CSV or JSON format to begin."
+
+# Summarizer used by each process pool worker
+_worker_summarizer = None
+
+
+def _init_worker(lexicon, instrumented=False):
+    """Build the worker's summarizer once per process from a pickled CompiledLexicon"""
+    global _worker_summarizer
+    _worker_summarizer = ChatLogSummarizer(lexicon=lexicon, metrics=StageMetrics() if instrumented else None)
+
+
+def _analyze_shard(shard):
+    """Analyze a shard of (conversation_id, message texts) pairs in a worker process
+    
+    Returns the results and, for instrumented workers, the shard's
+    (stage, event) pairs and (conversation_id, seconds) timings.
+    """
+    metrics = _worker_summarizer.metrics
+    if metrics is None:
+        return [_worker_summarizer.analyze_texts(conv_id, texts) for conv_id, texts in shard], None
+    
+    # Keep every conversation's timing, so the parent picks the slowest across all shards
+    metrics.reset()
+    metrics.top_n = len(shard)
+    events = []
+    metrics.hooks = [lambda stage, event: events.append((stage, event))]
+    results = [_worker_summarizer.analyze_texts(conv_id, texts) for conv_id, texts in shard]
+    return results, (events, metrics.slowest_conversations())
+
+
+def _analyze_request_batch(jobs, lexicons=None):
+    """Analyze a micro-batch of service requests and render each response
+    
+    Each job is (data, format_type, output, verbosity, lexicon fingerprint)
+    and is analyzed on its own, so a request that fails does not fail the
+    rest of its batch. `lexicons` maps the fingerprints that differ from the
+    worker's own lexicon to their CompiledLexicon. Returns, per job, either
+    (False, error text) or (True, list of response chunks).
+    """
+    summarizers = {fingerprint: ChatLogSummarizer(lexicon=lexicon) for fingerprint, lexicon in (lexicons or {}).items()}
+    responses = []
+    for data, format_type, output, verbosity, fingerprint in jobs:
+        try:
+            summarizer = summarizers.get(fingerprint, _worker_summarizer)
+            responses.append(_analyze_request(summarizer, data, format_type, output, verbosity))
+        except Exception as e:
+            responses.append((False, f"ERROR: Failed to analyze input data. {str(e)}"))
+    return responses
+
+
+def _analyze_request(summarizer, data, format_type, output, verbosity):
+    """Parse, analyze and render one service request"""
+    records, errors = summarizer.parse_input(data, format_type)
+    if errors:
+        return False, "\n".join(errors)
+    _, conversations = summarizer.validate_data(records)
+    results = summarizer.analyze_results(conversations)
+    
+    if output in ("json", "jsonl"):
+        # Both outputs carry the exact JSON Lines text that write_jsonl produces
+        lines = StringIO()
+        write_jsonl((structured_record(result) for result in results), lines)
+        if output == "jsonl":
+            return True, [lines.getvalue()]
+        return True, ['{"conversations": [', ",".join(lines.getvalue().split("\n")[:-1]), "]}\n"]
+    chunks = list(summarizer.iter_validation_report(len(conversations)))
+    chunks.extend(summarizer.render_analysis_report(results, len(conversations), verbosity))
+    return True, chunks
+
+
+class AnalysisService:
+    """Asyncio HTTP front-end that micro-batches analyze requests around ChatLogSummarizer
+    
+    Endpoints:
+        POST /analyze?format=csv|json&output=markdown|json|jsonl&verbosity=full|summary&lexicon=name
+        GET /stats
+        GET /health
+    
+    Requests name a rule set of `registry` with `lexicon=`, or get
+    `default_lexicon` from the registry, or else the summarizer's own
+    lexicon. Each request is pinned to the version current when it arrives,
+    and lexicons other than the one the workers started with are sent along
+    with the batch. `reload()` reloads changed rule set files; it runs every
+    `reload_interval` seconds if set, and on SIGHUP under serve_forever.
+    
+    Concurrent requests are collected for up to `batch_wait` seconds (or
+    `batch_size` requests) and sent to a process pool as one task, so the
+    event loop never runs the analysis itself and a failing request only
+    fails its own response. Responses are
+    streamed back with chunked transfer encoding. Requests beyond
+    `max_pending` are rejected with 503 and bodies over `max_body_size`
+    with 413.
+    """
+    
+    def __init__(self, summarizer=None, host="127.0.0.1", port=8080, workers=1, batch_size=32,
+                 batch_wait=0.01, max_pending=256, max_body_size=16 * 1024 * 1024, latency_window=10000,
+                 registry=None, default_lexicon=None, reload_interval=None):
+        self.summarizer = summarizer or ChatLogSummarizer()
+        self.registry = registry or LexiconRegistry()
+        self.default_lexicon = default_lexicon
+        self.reload_interval = reload_interval
+        self.reload_errors = 0
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_pending = max_pending
+        self.max_body_size = max_body_size
+        self.latencies = deque(maxlen=latency_window)
+        self.pending = 0
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.server = None
+        self.executor = None
+        self._queue = None
+        self._batch_task = None
+        self._batch_runs = set()
+        self._batch_slots = None
+        self._reload_task = None
+        self._pool_fingerprint = None
+    
+    async def start(self):
+        """Start the worker pool, the batching loop and the HTTP listener"""
+        lexicon = self.request_lexicon(None)
+        self._pool_fingerprint = lexicon.fingerprint
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(lexicon,))
+        # Start the workers before listening, so forked workers never inherit client sockets
+        await asyncio.get_running_loop().run_in_executor(self.executor, os.getpid)
+        
+        self._queue = asyncio.Queue()
+        self._batch_slots = asyncio.Semaphore(self.workers)
+        self._batch_task = asyncio.create_task(self._batch_loop())
+        if self.reload_interval:
+            self._reload_task = asyncio.create_task(self._reload_loop())
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self):
+        """Start the service and serve until cancelled, reloading lexicons on SIGHUP"""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        if hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, self.reload)
+        try:
+            await self.server.serve_forever()
+        finally:
+            if hasattr(signal, "SIGHUP"):
+                loop.remove_signal_handler(signal.SIGHUP)
+            await self.close()
+    
+    async def close(self):
+        """Stop accepting connections and shut down the worker pool"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+        if self._batch_runs:
+            # Let batches already on the pool answer their requests
+            await asyncio.gather(*self._batch_runs, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+    
+    def request_lexicon(self, name):
+        """Return the CompiledLexicon for a request's `lexicon` parameter, raising KeyError for unknown names"""
+        if name is None:
+            name = self.default_lexicon
+            if name is None:
+                return self.summarizer.get_lexicon()
+        return self.registry.get(name)
+    
+    def reload(self):
+        """Reload changed rule set files, keeping the current version of any that fail"""
+        try:
+            return self.registry.reload()
+        except ValueError as e:
+            self.reload_errors += 1
+            print(str(e), file=sys.stderr, flush=True)
+            return None
+    
+    async def _reload_loop(self):
+        """Reload changed rule set files every `reload_interval` seconds"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await loop.run_in_executor(None, self.reload)
+    
+    def latency_percentiles(self):
+        """Return p50 and p99 request latency in milliseconds over the recent window"""
+        if not self.latencies:
+            return {"p50_ms": None, "p99_ms": None}
+        ordered = sorted(self.latencies)
+        def percentile(fraction):
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+        return {"p50_ms": percentile(0.50), "p99_ms": percentile(0.99)}
+    
+    def stats(self):
+        """Return request counters and latency percentiles"""
+        stats = {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "pending": self.pending,
+            "batches": self.batches,
+            "lexicons": {name: self.registry.get(name).version for name in self.registry.names()},
+            "reload_errors": self.reload_errors
+        }
+        stats.update(self.latency_percentiles())
+        return stats
+    
+    async def _batch_loop(self):
+        """Collect queued requests into micro-batches and dispatch them to the pool"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Limit the number of batches in flight to the number of workers
+            await self._batch_slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_runs.add(task)
+            task.add_done_callback(self._batch_runs.discard)
+    
+    async def _run_batch(self, batch):
+        """Analyze one micro-batch on the pool and resolve each request's future"""
+        loop = asyncio.get_running_loop()
+        try:
+            self.batches += 1
+            jobs = []
+            lexicons = {}
+            for (data, format_type, output, verbosity, lexicon), _ in batch:
+                jobs.append((data, format_type, output, verbosity, lexicon.fingerprint))
+                if lexicon.fingerprint != self._pool_fingerprint:
+                    lexicons[lexicon.fingerprint] = lexicon
+            responses = await loop.run_in_executor(self.executor, _analyze_request_batch, jobs, lexicons)
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._batch_slots.release()
+    
+    async def _handle_connection(self, reader, writer):
+        """Serve one HTTP request per connection"""
+        started = time.perf_counter()
+        try:
+            request = await self._read_request(reader)
+            if isinstance(request, tuple):
+                await self._send(writer, *request)
+            else:
+                await self._route(request, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            await self._send(writer, 500, f"ERROR: {str(e)}")
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def _read_request(self, reader):
+        """Read the request line, headers and body, or return an (status, message) error"""
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            return 400, "ERROR: Malformed request line."
+        method, target, _ = parts
+        
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        body = b""
+        if method == "POST":
+            if "content-length" not in headers:
+                return 411, "ERROR: Content-Length header is required."
+            try:
+                length = int(headers["content-length"])
+            except ValueError:
+                return 400, "ERROR: Invalid Content-Length header."
+            if length > self.max_body_size:
+                return 413, f"ERROR: Request body exceeds {self.max_body_size} bytes."
+            body = await reader.readexactly(length)
+        
+        path, _, query = target.partition("?")
+        params = dict(parse_qsl(query))
+        return {"method": method, "path": path, "params": params, "headers": headers, "body": body}
+    
+    async def _route(self, request, writer):
+        """Dispatch a parsed request to its endpoint"""
+        if request["method"] == "GET" and request["path"] == "/health":
+            await self._send(writer, 200, "OK")
+        elif request["method"] == "GET" and request["path"] == "/stats":
+            await self._send(writer, 200, json.dumps(self.stats()), "application/json")
+        elif request["method"] == "POST" and request["path"] == "/analyze":
+            await self._analyze(request, writer)
+        else:
+            await self._send(writer, 404, "ERROR: Not found.")
+    
+    async def _analyze(self, request, writer):
+        """Queue an analyze request for the next micro-batch and stream back its response"""
+        params = request["params"]
+        content_type = request["headers"].get("content-type", "")
+        format_type = params.get("format") or ("json" if "json" in content_type else "csv")
+        output = params.get("output", "markdown")
+        verbosity = params.get("verbosity", VERBOSITY_FULL)
+        
+        if format_type not in ("csv", "json"):
+            await self._send(writer, 400, "ERROR: Invalid data format. Please provide data in CSV or JSON format.")
+            return
+        if output not in SERVICE_CONTENT_TYPES:
+            await self._send(writer, 400, "ERROR: Invalid output. Use 'markdown', 'json' or 'jsonl'.")
+            return
+        try:
+            lexicon = self.request_lexicon(params.get("lexicon"))
+        except KeyError:
+            await self._send(writer, 400, f"ERROR: Unknown lexicon '{params.get('lexicon')}'.")
+            return
+        
+        # Backpressure: refuse work beyond the pending limit instead of queueing without bound
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            await self._send(writer, 503, "ERROR: Service is busy. Please retry later.", extra_headers={"Retry-After": "1"})
+            return
+        
+        try:
+            data = request["body"].decode("utf-8-sig")
+        except UnicodeDecodeError:
+            await self._send(writer, 400, "ERROR: Request body must be UTF-8 encoded.")
+            return
+        
+        self.pending += 1
+        self.requests += 1
+        try:
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put(((data, format_type, output, verbosity, lexicon), future))
+            ok, response = await future
+        finally:
+            self.pending -= 1
+        
+        if not ok:
+            await self._send(writer, 422, response)
+            return
+        
+        await self._send_chunked(writer, 200, response, SERVICE_CONTENT_TYPES[output])
+    
+    async def _send(self, writer, status, body, content_type="text/plain; charset=utf-8", extra_headers=None):
+        """Write a complete response"""
+        payload = body.encode("utf-8")
+        headers = {"Content-Type": content_type, "Content-Length": str(len(payload))}
+        headers.update(extra_headers or {})
+        writer.write(http_head(status, headers) + payload)
+        await writer.drain()
+    
+    async def _send_chunked(self, writer, status, chunks, content_type):
+        """Stream a response chunk by chunk, waiting for the client to keep up"""
+        writer.write(http_head(status, {"Content-Type": content_type, "Transfer-Encoding": "chunked"}))
+        for chunk in chunks:
+            payload = chunk.encode("utf-8")
+            if payload:
+                writer.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+# Response content type for each output of the analysis service
+SERVICE_CONTENT_TYPES = {
+    "markdown": "text/markdown; charset=utf-8",
+    "json": "application/json",
+    "jsonl": "application/x-ndjson"
+}
+
+
+def http_head(status, headers):
+    """Build an HTTP/1.1 status line and headers"""
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def tail_lines(path, poll_interval=1.0, stop=None, from_start=True, header_lines=0):
+    """Follow a growing text file like `tail -F`, yielding (generation, line) for each complete line
+    
+    `generation` increases whenever the file is replaced (rotation) or
+    truncated, and reading restarts at the beginning of the new file. None
+    is yielded each time the reader has caught up, before it sleeps for
+    `poll_interval` seconds. Following ends once `stop()` returns True.
+    Without `from_start`, lines already in the file are skipped, except for
+    the first `header_lines`, which are always yielded.
+    """
+    generation = 0
+    stream = None
+    buffer = b""
+    try:
+        while stop is None or not stop():
+            if stream is None:
+                try:
+                    stream = open(path, "rb")
+                except FileNotFoundError:
+                    yield None
+                    time.sleep(poll_interval)
+                    continue
+                buffer = b""
+                if not from_start and generation == 0:
+                    header = [stream.readline() for _ in range(header_lines)]
+                    if all(line.endswith(b"\n") for line in header):
+                        for line in header:
+                            yield generation, line[:-1].rstrip(b"\r").decode("utf-8-sig", errors="replace")
+                        stream.seek(0, os.SEEK_END)
+                    else:
+                        # The header is still being written, so nothing can be skipped yet
+                        stream.seek(0)
+            
+            chunk = stream.read(STREAM_CHUNK_SIZE)
+            if chunk:
+                lines = (buffer + chunk).split(b"\n")
+                buffer = lines.pop()
+                for line in lines:
+                    yield generation, line.rstrip(b"\r").decode("utf-8-sig", errors="replace")
+                continue
+            
+            # Caught up: reopen if the path now points at a new or truncated file
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+            if current is None or current.st_ino != os.fstat(stream.fileno()).st_ino or current.st_size < stream.tell():
+                stream.close()
+                stream = None
+                generation += 1
+                continue
+            
+            yield None
+            time.sleep(poll_interval)
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+class ConversationState:
+    """Running totals for one followed conversation"""
+    
+    __slots__ = ("message_count", "word_total", "positive_count", "negative_count", "category_counts",
+                 "context", "last_seen", "classification")
+    
+    def __init__(self, category_count):
+        self.message_count = 0
+        self.word_total = 0
+        self.positive_count = 0
+        self.negative_count = 0
+        # One slot per category plus a final slot for "Other", so index -1 lands there
+        self.category_counts = [0] * (category_count + 1)
+        self.context = ScanContext()
+        self.last_seen = 0.0
+        self.classification = None
+
+
+class LiveSummarizer:
+    """Per-conversation summaries that update in constant time as messages arrive
+    
+    Each conversation keeps its message and word totals, sentiment counts,
+    category counts and keyword matcher position, so a new message is
+    scanned on its own and never re-reads the conversation. Summaries match
+    what `analyze_conversation` reports for the same messages.
+    
+    `on_change(conversation_id, previous, current)` is called whenever a
+    conversation's (sentiment_category, dominant_category) classification
+    changes; `previous` is None for a conversation's first message.
+    Conversations idle for longer than `ttl` seconds, or beyond the
+    `max_conversations` most recently updated, are evicted.
+    """
+    
+    def __init__(self, summarizer=None, on_change=None, ttl=None, max_conversations=10000, clock=time.monotonic):
+        self.summarizer = summarizer or ChatLogSummarizer()
+        self.matcher = self.summarizer.get_matcher()
+        self.categories = self.matcher.categories + ["Other"]
+        self.on_change = on_change
+        self.ttl = ttl
+        self.max_conversations = max_conversations
+        self.clock = clock
+        self.conversations = OrderedDict()
+        self.evicted = 0
+    
+    def __len__(self):
+        return len(self.conversations)
+    
+    def add(self, record):
+        """Fold one validated record into its conversation, returning the conversation's classification"""
+        conversation_id = intern_value(record["conversation_id"])
+        state = self.conversations.get(conversation_id)
+        if state is None:
+            state = self.conversations[conversation_id] = ConversationState(len(self.matcher.categories))
+        else:
+            self.conversations.move_to_end(conversation_id)
+        
+        text = record["message"]
+        separator_positive, separator_negative, positive, negative, category = self.matcher.scan_next(text.lower(), state.context)
+        state.message_count += 1
+        state.word_total += len(text.split())
+        state.positive_count += separator_positive + positive
+        state.negative_count += separator_negative + negative
+        state.category_counts[category] += 1
+        state.last_seen = self.clock()
+        
+        summary = self.summary(conversation_id)
+        classification = (summary["sentiment"]["sentiment_category"], summary["categorization"]["dominant_category"])
+        if classification != state.classification:
+            previous = state.classification
+            state.classification = classification
+            if self.on_change is not None:
+                self.on_change(conversation_id, previous, classification)
+        
+        self.evict(state.last_seen)
+        return classification
+    
+    def summary(self, conversation_id):
+        """Return the current metrics, sentiment and categorization of a followed conversation"""
+        state = self.conversations[conversation_id]
+        return {
+            "conversation_id": conversation_id,
+            "metrics": self.summarizer.metrics_from_totals(state.message_count, state.word_total),
+            "sentiment": self.summarizer.sentiment_from_counts(state.positive_count, state.negative_count),
+            "categorization": self.summarizer.categorization_from_counts(dict(zip(self.categories, state.category_counts)))
+        }
+    
+    def evict(self, now=None):
+        """Drop conversations past the TTL or beyond `max_conversations`, least recently updated first"""
+        if now is None:
+            now = self.clock()
+        conversations = self.conversations
+        while len(conversations) > self.max_conversations:
+            conversations.popitem(last=False)
+            self.evicted += 1
+        if self.ttl is not None:
+            while conversations and next(iter(conversations.values())).last_seen <= now - self.ttl:
+                conversations.popitem(last=False)
+                self.evicted += 1
+
+
+class LexiconRegistry:
+    """Named, versioned rule sets loaded from JSON files and compiled once
+    
+    A rule set file holds any of the DEFAULT_LEXICON keys; missing keys keep
+    their defaults. Registering or reloading a name compiles the new rules
+    first and then swaps them in under a lock, bumping the version. A
+    summarizer keeps the CompiledLexicon it was created with, so analyses
+    already running finish on the old version while new summarizers get the
+    new one. A rule set that fails validation leaves the current version in
+    place.
+    """
+    
+    def __init__(self):
+        self._lexicons = {}
+        self._sources = {}
+        self._lock = threading.Lock()
+    
+    def __contains__(self, name):
+        return name in self._lexicons
+    
+    def names(self):
+        """Return the registered lexicon names"""
+        return sorted(self._lexicons)
+    
+    def get(self, name):
+        """Return the current version of a lexicon"""
+        return self._lexicons[name]
+    
+    def summarizer(self, name, **kwargs):
+        """Create a summarizer pinned to the current version of a lexicon"""
+        return ChatLogSummarizer(lexicon=self.get(name), **kwargs)
+    
+    def register(self, name, rules):
+        """Validate, compile and publish a rule set under `name`, returning the new version"""
+        state = lexicon_state(rules)
+        categories = list(state["category_keywords"]) + ["Other"]
+        missing_priority = [category for category in categories if category not in state["category_priority"]]
+        missing_recommendations = [category for category in categories if category not in state["recommendations"]]
+        if missing_priority:
+            raise ValueError(f"ERROR: Lexicon '{name}' is missing category priority for: {', '.join(missing_priority)}.")
+        if missing_recommendations:
+            raise ValueError(f"ERROR: Lexicon '{name}' is missing recommendations for: {', '.join(missing_recommendations)}.")
+        
+        with self._lock:
+            current = self._lexicons.get(name)
+            lexicon = CompiledLexicon(state, name=name, version=current.version + 1 if current else 1)
+            self._lexicons[name] = lexicon
+        return lexicon
+    
+    def load(self, name, path):
+        """Load a rule set from a JSON file and register it under `name`"""
+        modified = os.stat(path).st_mtime_ns
+        with open(path, encoding="utf-8") as f:
+            try:
+                rules = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"ERROR: Failed to parse lexicon '{name}'. {str(e)}") from e
+        if not isinstance(rules, dict):
+            raise ValueError(f"ERROR: Lexicon '{name}' must be a JSON object.")
+        
+        lexicon = self.register(name, rules)
+        self._sources[name] = (path, modified)
+        return lexicon
+    
+    def load_directory(self, directory):
+        """Load every *.json rule set in a directory, named after the file"""
+        for entry in sorted(os.listdir(directory)):
+            if entry.endswith(".json"):
+                self.load(entry[:-len(".json")], os.path.join(directory, entry))
+        return self.names()
+    
+    def reload(self):
+        """Reload rule set files that changed on disk, returning the reloaded names
+        
+        Every changed file is tried; if any fail, their errors are raised
+        together after the others have been reloaded.
+        """
+        reloaded = []
+        errors = []
+        for name, (path, modified) in list(self._sources.items()):
+            if os.stat(path).st_mtime_ns != modified:
+                try:
+                    self.load(name, path)
+                except ValueError as e:
+                    errors.append(str(e))
+                    continue
+                reloaded.append(name)
+        if errors:
+            raise ValueError("\n".join(errors))
+        return reloaded
+
+
+def load_cli_registry(lexicon_path=None, lexicon_dir=None):
+    """Load the rule set files given on the command line, returning the registry and the default lexicon name
+    
+    The default is the `lexicon_path` file, named after the file, or None
+    to keep the built-in lexicon.
+    """
+    registry = LexiconRegistry()
+    if lexicon_dir is not None:
+        registry.load_directory(lexicon_dir)
+    if lexicon_path is None:
+        return registry, None
+    name = os.path.splitext(os.path.basename(lexicon_path))[0]
+    registry.load(name, lexicon_path)
+    return registry, name
+
+
+def serve(argv=None):
+    """Run the analysis HTTP service from the command line"""
+    parser = argparse.ArgumentParser(description="Serve ChatLogSummarizer over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batch-wait", type=float, default=0.01, help="seconds to wait while filling a batch")
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--lexicon", metavar="FILE", help="JSON rule set to use instead of the default lexicon")
+    parser.add_argument("--lexicon-dir", metavar="DIR", help="directory of *.json rule sets requests can pick with lexicon=")
+    parser.add_argument("--reload-interval", type=float, help="seconds between checks for changed rule set files")
+    args = parser.parse_args(argv)
+    
+    registry, default_lexicon = load_cli_registry(args.lexicon, args.lexicon_dir)
+    service = AnalysisService(
+        host=args.host, port=args.port, workers=args.workers, batch_size=args.batch_size, batch_wait=args.batch_wait,
+        max_pending=args.max_pending, registry=registry, default_lexicon=default_lexicon,
+        reload_interval=args.reload_interval
+    )
+    print(f"Serving ChatLogSummarizer on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+def follow(argv=None):
+    """Follow a growing chat log from the command line, printing classification changes"""
+    parser = argparse.ArgumentParser(description="Follow a chat log and report conversation classification changes")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--ttl", type=float, help="seconds of inactivity before a conversation is dropped")
+    parser.add_argument("--max-conversations", type=int, default=10000)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--from-end", action="store_true", help="skip lines already in the file")
+    parser.add_argument("--lexicon", metavar="FILE", help="JSON rule set to use instead of the default lexicon")
+    args = parser.parse_args(argv)
+    
+    def report_change(conversation_id, previous, current):
+        alert = "ALERT " if current[0] == "Negative" or current[1] == "Complaint" else ""
+        before = "new" if previous is None else "/".join(previous)
+        print(f"{alert}{conversation_id}: {before} -> {'/'.join(current)}", flush=True)
+    
+    def report_error(message):
+        print(message, file=sys.stderr, flush=True)
+    
+    registry, name = load_cli_registry(args.lexicon)
+    summarizer = ChatLogSummarizer() if name is None else registry.summarizer(name)
+    try:
+        summarizer.follow(
+            args.path, args.format, on_change=report_change, ttl=args.ttl, max_conversations=args.max_conversations,
+            poll_interval=args.poll_interval, from_start=not args.from_end, on_error=report_error
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+# Example data, also used as a regression fixture for the parallel and streaming paths
+EXAMPLE_JSON = """{
+    "conversations": [
+        {
+        "conversation_id": "conv100",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "I need help with my account."
+        },
+        {
+        "conversation_id": "conv100",
+        "sender": "agent",
+        "timestamp": "12-03-2021",
+        "message": "Sure, I can help you with your account details."
+        },
+        {
+        "conversation_id": "conv100",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "I forgot my password and cannot log in."
+        },
+        {
+        "conversation_id": "conv100",
+        "sender": "agent",
+        "timestamp": "12-03-2021",
+        "message": "Please try resetting your password using the 'Forgot Password' link."
+        },
+        {
+        "conversation_id": "conv100",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "I will try that, thank you."
+        },
+        {
+        "conversation_id": "conv101",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "I recently updated the software and noticed several performance issues, including slow loading times and frequent crashes that disrupt my workflow significantly."
+        },
+        {
+        "conversation_id": "conv101",
+        "sender": "agent",
+        "timestamp": "12-03-2021",
+        "message": "We apologize for the inconvenience caused by the update; our technical team is actively investigating these performance issues and working on a patch to enhance stability and speed."
+        },
+        {
+        "conversation_id": "conv101",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "The update not only affected performance but also changed the interface drastically, making it difficult to navigate, which has impacted my overall user experience."
+        },
+        {
+        "conversation_id": "conv101",
+        "sender": "agent",
+        "timestamp": "12-03-2021",
+        "message": "Thank you for your detailed feedback; we are documenting your concerns and will prioritize improvements in our next update to ensure a better user experience."
+        },
+        {
+        "conversation_id": "conv101",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "I appreciate the prompt response and detailed explanation regarding the ongoing efforts to resolve these issues."
+        },
+        {
+        "conversation_id": "conv102",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "I am very satisfied with the recent improvements in the service quality and customer support."
+        },
+        {
+        "conversation_id": "conv102",
+        "sender": "agent",
+        "timestamp": "12-03-2021",
+        "message": "Thank you for your positive feedback; we are glad you enjoy the new design and improved features."
+        },
+        {
+        "conversation_id": "conv102",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "The new features have improved navigation and overall functionality remarkably."
+        },
+        {
+        "conversation_id": "conv102",
+        "sender": "agent",
+        "timestamp": "12-03-2021",
+        "message": "We appreciate your kind words and are committed to further enhancing our service."
+        },
+        {
+        "conversation_id": "conv102",
+        "sender": "customer",
+        "timestamp": "12-03-2021",
+        "message": "Please keep up the great work and continue to listen to your customers."
+        }
+    ]
+    }
+"""
+
+
+# Example usage
+def main(workers=None):
+    summarizer = ChatLogSummarizer()
+    # # Example data
+    # example_csv = """conversation_id,sender,timestamp,message
+    # conv1,customer,01-02-2023,"Hello, I have a problem with my order."
+    # conv1,agent,01-02-2023,"I'm sorry to hear that. What seems to be the issue?"
+    # conv1,customer,01-02-2023,"The product arrived damaged. I'm very unhappy with this."
+    # conv1,agent,01-02-2023,"I apologize for the inconvenience. We'll send a replacement right away."
+    # conv2,customer,02-02-2023,"Thank you for the excellent service! I'm very happy with my purchase."
+    # conv2,agent,02-02-2023,"You're welcome! We're glad you had a great experience."
+    # """
+    # # Process CSV data
+    # print("=== CSV Data Analysis ===")
+    # csv_report = summarizer.process_data(example_csv, "csv")
+    # print(csv_report)
+    
+    print("\n\n=== JSON Data Analysis ===")
+    json_report = summarizer.process_data(EXAMPLE_JSON, "json", workers)
+    print(json_report)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["serve"]:
+        serve(sys.argv[2:])
+    elif sys.argv[1:2] == ["follow"]:
+        follow(sys.argv[2:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,301 @@
+"""Benchmarks for ChatLogSummarizer-AI-LLM.py
+
+Usage:
+    python benchmark.py generate OUTPUT [--format csv|json] [generator options]
+    python benchmark.py run [--format csv|json] [generator options] [--save-baseline FILE] [--baseline FILE]
+    python benchmark.py records [generator options]
+
+The generator options are --conversations, --messages, --words, --keyword-density
+and --seed. Generated data is deterministic for a given set of options.
+"""
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from io import StringIO
+
+SUMMARIZER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ChatLogSummarizer-AI-LLM.py")
+
+# Words used for the non-keyword part of generated messages
+FILLER_WORDS = [
+    "order", "account", "delivery", "refund", "price", "store", "online", "help", "please", "today",
+    "yesterday", "package", "arrived", "checked", "support", "team", "update", "password", "login", "card",
+    "the", "a", "my", "your", "we", "you", "is", "was", "and", "with", "for", "about", "can", "will", "not",
+]
+
+# Stages timed by the run command, in pipeline order
+STAGES = [
+    "parse_input",
+    "validate_data",
+    "calculate_conversation_metrics",
+    "calculate_sentiment",
+    "categorize_chat",
+    "analyze_results",
+    "analyze_batch",
+    "render_report",
+]
+
+
+def load_summarizer_module():
+    """Import ChatLogSummarizer-AI-LLM.py, whose file name is not a valid module name
+    
+    The module is registered as "chatlog_summarizer" in sys.modules, so worker
+    processes can unpickle the functions it sends them.
+    """
+    module = sys.modules.get("chatlog_summarizer")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("chatlog_summarizer", SUMMARIZER_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["chatlog_summarizer"] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules["chatlog_summarizer"]
+            raise
+    return module
+
+
+def generate_records(summarizer, conversations=1000, messages=10, words=15, keyword_density=0.1, seed=0):
+    """Yield deterministic synthetic records in the conversation_id,sender,timestamp,message schema
+    
+    `keyword_density` is the fraction of message words drawn from the
+    summarizer's sentiment words and category keywords.
+    """
+    rng = random.Random(seed)
+    keywords = list(summarizer.positive_words) + list(summarizer.negative_words)
+    for category_keywords in summarizer.category_keywords.values():
+        keywords.extend(category_keywords)
+    
+    for c in range(conversations):
+        timestamp = f"{c % 28 + 1:02d}-{c // 28 % 12 + 1:02d}-2021"
+        for m in range(messages):
+            message_words = [
+                rng.choice(keywords) if rng.random() < keyword_density else rng.choice(FILLER_WORDS)
+                for _ in range(max(1, int(rng.gauss(words, words / 4))))
+            ]
+            yield {
+                "conversation_id": f"conv{c}",
+                "sender": "customer" if m % 2 == 0 else "agent",
+                "timestamp": timestamp,
+                "message": " ".join(message_words).capitalize() + "."
+            }
+
+
+def format_records(records, format_type):
+    """Serialize records as a CSV or JSON export"""
+    if format_type == "csv":
+        output = StringIO()
+        writer = csv.DictWriter(output, ["conversation_id", "sender", "timestamp", "message"])
+        writer.writeheader()
+        writer.writerows(records)
+        return output.getvalue()
+    return json.dumps({"conversations": list(records)}, indent=2)
+
+
+def generate_data(summarizer, args):
+    """Build the synthetic export described by the command-line options"""
+    records = generate_records(
+        summarizer, args.conversations, args.messages, args.words, args.keyword_density, args.seed
+    )
+    return format_records(records, args.format)
+
+
+def measure(function, trace_memory=False):
+    """Run `function` once, returning its result, wall time and peak traced memory"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_stages(summarizer, data, format_type):
+    """Run each pipeline stage once, returning {stage: callable} bound to the previous stage's output
+    
+    analyze_batch is left out when NumPy is not installed.
+    """
+    records, errors = summarizer.parse_input(data, format_type)
+    if errors:
+        raise SystemExit("\n".join(errors[:5]))
+    _, conversations = summarizer.validate_data(records)
+    results = summarizer.analyze_results(conversations)
+    
+    stages = {
+        "parse_input": lambda: summarizer.parse_input(data, format_type),
+        "validate_data": lambda: summarizer.validate_data(records),
+        "calculate_conversation_metrics": lambda: [summarizer.calculate_conversation_metrics(m) for m in conversations.values()],
+        "calculate_sentiment": lambda: [summarizer.calculate_sentiment(m) for m in conversations.values()],
+        "categorize_chat": lambda: [summarizer.categorize_chat(m) for m in conversations.values()],
+        "analyze_results": lambda: summarizer.analyze_results(conversations),
+        "analyze_batch": lambda: summarizer.analyze_batch(conversations),
+        "render_report": lambda: "".join(summarizer.render_conversation(result) for result in results),
+    }
+    try:
+        summarizer.analyze_batch({})
+    except ImportError:
+        # The columnar engine needs NumPy
+        del stages["analyze_batch"]
+    return stages
+
+
+def bench_run(args):
+    """Time every stage and compare against a saved baseline"""
+    module = load_summarizer_module()
+    summarizer = module.ChatLogSummarizer()
+    data = generate_data(summarizer, args)
+    message_count = args.conversations * args.messages
+    stages = run_stages(summarizer, data, args.format)
+    
+    report = {
+        "config": {
+            "format": args.format,
+            "conversations": args.conversations,
+            "messages": args.messages,
+            "words": args.words,
+            "keyword_density": args.keyword_density,
+            "seed": args.seed,
+            "input_bytes": len(data.encode("utf-8")),
+        },
+        "stages": {},
+    }
+    
+    print(f"{'stage':<32}{'seconds':>10}{'messages/s':>14}{'peak MiB':>10}")
+    for stage in STAGES:
+        if stage not in stages:
+            print(f"{stage:<32}{'skipped':>10}")
+            continue
+        # Best of several untraced runs for timing, then one traced run for memory
+        best = min(measure(stages[stage])[1] for _ in range(args.repeat))
+        _, _, peak = measure(stages[stage], trace_memory=True)
+        report["stages"][stage] = {
+            "seconds": best,
+            "messages_per_second": message_count / best if best else 0.0,
+            "peak_memory_bytes": peak,
+        }
+        print(f"{stage:<32}{best:>10.4f}{message_count / best if best else 0.0:>14,.0f}{peak / 2**20:>10.1f}")
+    
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+    
+    if args.baseline:
+        return compare_baseline(report, args.baseline, args.tolerance)
+    return 0
+
+
+def compare_baseline(report, baseline_path, tolerance):
+    """Print the change per stage against a baseline and return 1 if any stage regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    
+    if baseline.get("config") != report["config"]:
+        print("\nWARNING: baseline was recorded with a different configuration")
+    
+    print(f"\n{'stage':<32}{'baseline':>10}{'current':>10}{'change':>10}")
+    regressed = []
+    for stage in STAGES:
+        if stage not in baseline["stages"] or stage not in report["stages"]:
+            continue
+        before = baseline["stages"][stage]["seconds"]
+        after = report["stages"][stage]["seconds"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > tolerance:
+            regressed.append(stage)
+            flag = "  REGRESSION"
+        print(f"{stage:<32}{before:>10.4f}{after:>10.4f}{change:>+10.1%}{flag}")
+    
+    if regressed:
+        print(f"\nRegressions beyond {tolerance:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+def bench_generate(args):
+    """Write a synthetic export to a file"""
+    module = load_summarizer_module()
+    data = generate_data(module.ChatLogSummarizer(), args)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(data)
+    print(f"Wrote {args.conversations * args.messages} records ({len(data):,} bytes) to {args.output}")
+    return 0
+
+
+def retained_memory(build):
+    """Return the bytes still allocated by the object `build()` returns"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def bench_records(args):
+    """Compare the memory held by per-row dicts against compact Message records"""
+    module = load_summarizer_module()
+    summarizer = module.ChatLogSummarizer()
+    args.format = "csv"
+    data = generate_data(summarizer, args)
+    rows = args.conversations * args.messages
+    
+    dict_bytes = retained_memory(lambda: list(csv.DictReader(StringIO(data))))
+    message_bytes = retained_memory(lambda: summarizer.parse_input(data, "csv")[0])
+    
+    print(f"Records: {rows}")
+    print(f"dict records:    {dict_bytes:>12,} bytes ({dict_bytes / rows:.1f} bytes/record)")
+    print(f"Message records: {message_bytes:>12,} bytes ({message_bytes / rows:.1f} bytes/record)")
+    print(f"Reduction: {100 * (1 - message_bytes / dict_bytes):.1f}%")
+    return 0
+
+
+def add_generator_options(parser):
+    """Add the synthetic data options shared by every command"""
+    parser.add_argument("--conversations", type=int, default=1000, help="number of conversations")
+    parser.add_argument("--messages", type=int, default=10, help="messages per conversation")
+    parser.add_argument("--words", type=int, default=15, help="average words per message")
+    parser.add_argument("--keyword-density", type=float, default=0.1, help="fraction of words that are lexicon keywords")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ChatLogSummarizer")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    generate_parser = subparsers.add_parser("generate", help="write a synthetic chat log export")
+    generate_parser.add_argument("output")
+    generate_parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    add_generator_options(generate_parser)
+    generate_parser.set_defaults(run=bench_generate)
+    
+    run_parser = subparsers.add_parser("run", help="time each pipeline stage")
+    run_parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    run_parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    run_parser.add_argument("--save-baseline", metavar="FILE", help="save the results as a baseline")
+    run_parser.add_argument("--baseline", metavar="FILE", help="compare the results against a saved baseline")
+    run_parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown before a stage counts as a regression")
+    add_generator_options(run_parser)
+    run_parser.set_defaults(run=bench_run)
+    
+    records_parser = subparsers.add_parser("records", help="compare record memory usage")
+    add_generator_options(records_parser)
+    records_parser.set_defaults(run=bench_records)
+    
+    args = parser.parse_args()
+    sys.exit(args.run(args))
+
+
+if __name__ == "__main__":
+    main()
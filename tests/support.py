@@ -0,0 +1,65 @@
+"""Shared setup for the tests: the summarizer module and deterministic sample exports"""
+import asyncio
+import io
+import os
+import random
+import sys
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import benchmark
+
+chatlog = benchmark.load_summarizer_module()
+
+# Reports rendered by the original single-threaded implementation
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(name):
+    """Return a fixture file's text with its line endings untouched"""
+    with open(os.path.join(FIXTURES, name), encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def shuffled_records(conversations=12, messages=5, seed=3):
+    """Return generated records with the conversations interleaved"""
+    records = list(benchmark.generate_records(chatlog.ChatLogSummarizer(), conversations, messages, 15, 0.2, seed))
+    random.Random(seed).shuffle(records)
+    return records
+
+
+def stream_report(summarizer, data, format_type, workers=None):
+    """Render a report with write_stream_report from an in-memory export"""
+    sink = StringIO()
+    summarizer.write_stream_report(io.BytesIO(data.encode("utf-8")), format_type, sink, workers)
+    return sink.getvalue()
+
+
+async def http_request(port, method, target, body=b"", headers=None):
+    """Send one request and return (status, headers, body), decoding a chunked body"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = [f"{method} {target} HTTP/1.1", "Host: localhost"]
+    if method == "POST":
+        head.append(f"Content-Length: {len(body)}")
+    head.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    
+    head, _, payload = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    response_headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:])}
+    if response_headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size_line, _, payload = payload.partition(b"\r\n")
+            size = int(size_line, 16)
+            if size == 0:
+                break
+            chunks.append(payload[:size])
+            payload = payload[size + 2:]
+        payload = b"".join(chunks)
+    return status, response_headers, payload.decode("utf-8")
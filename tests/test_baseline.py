@@ -0,0 +1,42 @@
+"""Every analysis path must render the report of the original implementation"""
+import unittest
+
+from support import benchmark, chatlog, read_fixture, shuffled_records, stream_report
+
+
+class BaselineReportTest(unittest.TestCase):
+    def setUp(self):
+        # generated_report.md was rendered from these records
+        self.records = shuffled_records()
+        self.expected = read_fixture("generated_report.md")
+    
+    def test_example_matches_baseline(self):
+        report = chatlog.ChatLogSummarizer().process_data(chatlog.EXAMPLE_JSON, "json")
+        self.assertEqual(report, read_fixture("example_report.md"))
+    
+    def test_serial_matches_baseline(self):
+        for format_type in ("csv", "json"):
+            data = benchmark.format_records(self.records, format_type)
+            self.assertEqual(chatlog.ChatLogSummarizer().process_data(data, format_type), self.expected, format_type)
+    
+    def test_workers_match_baseline(self):
+        data = benchmark.format_records(self.records, "json")
+        self.assertEqual(chatlog.ChatLogSummarizer().process_data(data, "json", workers=2), self.expected)
+        self.assertEqual(chatlog.ChatLogSummarizer().process_data(chatlog.EXAMPLE_JSON, "json", workers=2),
+                         read_fixture("example_report.md"))
+    
+    def test_stream_report_matches_baseline(self):
+        for format_type in ("csv", "json"):
+            data = benchmark.format_records(self.records, format_type)
+            self.assertEqual(stream_report(chatlog.ChatLogSummarizer(), data, format_type), self.expected, format_type)
+            self.assertEqual(stream_report(chatlog.ChatLogSummarizer(), data, format_type, workers=2), self.expected, format_type)
+    
+    def test_stream_report_of_grouped_input(self):
+        records = sorted(self.records, key=lambda record: record["conversation_id"])
+        data = benchmark.format_records(records, "csv")
+        expected = chatlog.ChatLogSummarizer().process_data(data, "csv")
+        self.assertEqual(stream_report(chatlog.ChatLogSummarizer(), data, "csv"), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""The NumPy batch engine must match the per-conversation analysis"""
+import random
+import unittest
+
+from support import benchmark, chatlog, shuffled_records
+
+
+@unittest.skipIf(chatlog.np is None, "NumPy is not installed")
+class BatchAnalyzerTest(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = chatlog.ChatLogSummarizer()
+    
+    def conversations(self, data, format_type):
+        records, errors = self.summarizer.parse_input(data, format_type)
+        self.assertEqual(errors, [])
+        return self.summarizer.validate_data(records)[1]
+    
+    def test_matches_analyze_results(self):
+        for data in (chatlog.EXAMPLE_JSON, benchmark.format_records(shuffled_records(40, 8), "json")):
+            conversations = self.conversations(data, "json")
+            self.assertEqual(self.summarizer.analyze_batch(conversations), self.summarizer.analyze_results(conversations))
+    
+    def test_matches_with_automaton_lexicon(self):
+        # Enough keywords to go past direct scanning, so sentiment words can span messages
+        words = [f"word{i}" for i in range(chatlog.DIRECT_SCAN_MAX_PATTERNS)]
+        summarizer = chatlog.ChatLogSummarizer()
+        summarizer.positive_words = summarizer.positive_words + words + ["very good"]
+        conversations = {
+            "c1": [{"message": "it was very"}, {"message": "good word3"}],
+            "c2": [{"message": "Very"}, {"message": "GOOD and word7 and Great"}]
+        }
+        self.assertEqual(summarizer.analyze_batch(conversations), summarizer.analyze_results(conversations))
+    
+    def test_word_counts_match_split(self):
+        analyzer = chatlog.BatchAnalyzer(self.summarizer)
+        characters = [" ", "\t", "\n", "\x1c", "\x85", "\xa0", " ", "　", "​", "a", "é", "\U0001f600"]
+        rng = random.Random(5)
+        for _ in range(500):
+            texts = ["".join(rng.choice(characters) for _ in range(rng.randint(0, 10))) for _ in range(rng.randint(0, 6))]
+            with self.subTest(texts=texts):
+                self.assertEqual(analyzer.count_words(texts).tolist(), [len(text.split()) for text in texts])
+    
+    def test_empty_input(self):
+        self.assertEqual(self.summarizer.analyze_batch({}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import os
+import tempfile
+import unittest
+
+from support import benchmark, chatlog, shuffled_records
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache = chatlog.ResultCache(os.path.join(temp_dir.name, "cache.db"))
+        self.addCleanup(self.cache.close)
+        self.data = benchmark.format_records(shuffled_records(), "json")
+    
+    def test_cached_report_matches_uncached(self):
+        expected = chatlog.ChatLogSummarizer().process_data(self.data, "json")
+        # The first run fills the cache, the second is served from it
+        for _ in range(2):
+            summarizer = chatlog.ChatLogSummarizer(cache=self.cache)
+            self.assertEqual(summarizer.process_data(self.data, "json"), expected)
+    
+    def test_cached_stream_matches_uncached(self):
+        records = sorted(shuffled_records(), key=lambda record: record["conversation_id"])
+        data = benchmark.format_records(records, "csv").encode("utf-8")
+        expected = list(chatlog.ChatLogSummarizer().process_stream(io.BytesIO(data), "csv"))
+        for _ in range(2):
+            summarizer = chatlog.ChatLogSummarizer(cache=self.cache)
+            self.assertEqual(list(summarizer.process_stream(io.BytesIO(data), "csv")), expected)
+    
+    
+    def test_get_many_matches_get(self):
+        self.cache.bind("lexicon")
+        self.cache.put_many([("c1", "h1", {"n": 1}), ("c2", "h2", {"n": 2})])
+        keys = [("c1", "h1"), ("c2", "stale"), ("c3", "h3"), ("c2", "h2"), ("c1", "h1")]
+        self.assertEqual(self.cache.get_many(keys), [{"n": 1}, None, None, {"n": 2}, {"n": 1}])
+        self.assertEqual(self.cache.stats(), {"hits": 3, "misses": 2})
+        self.assertEqual([self.cache.get(*key) for key in keys], self.cache.get_many(keys))
+        self.assertEqual(self.cache.get_many([]), [])
+    
+    def test_lookups_run_one_query_per_batch(self):
+        summarizer = chatlog.ChatLogSummarizer(cache=self.cache)
+        summarizer.process_data(self.data, "json")
+        statements = []
+        self.cache.connection.set_trace_callback(statements.append)
+        summarizer.process_data(self.data, "json")
+        self.assertEqual(len([s for s in statements if s.startswith("SELECT result")]), 0)
+        self.assertEqual(len([s for s in statements if s.startswith("SELECT conversation_id")]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import csv
+import random
+import unittest
+from io import StringIO
+
+from support import chatlog
+
+
+class CsvScanTest(unittest.TestCase):
+    PIECES = ["a", "b", "", ",", '"', '""', "\n", "\r\n", " ", "é", "x,y", "hello world", "😀", "issue"]
+    
+    def setUp(self):
+        chunk_size = chatlog.CSV_SCAN_CHUNK_SIZE
+        self.addCleanup(setattr, chatlog, "CSV_SCAN_CHUNK_SIZE", chunk_size)
+        self.summarizer = chatlog.ChatLogSummarizer()
+    
+    def dictreader_parse(self, data):
+        """Parse and validate CSV text the way the original implementation did"""
+        try:
+            records = [chatlog.Message.from_mapping(row) for row in csv.DictReader(StringIO(data))]
+        except Exception as e:
+            return [], [f"ERROR: Failed to parse input data. {str(e)}"]
+        errors = []
+        for row_number, record in enumerate(records, 1):
+            errors.extend(self.summarizer.validate_record(record, row_number))
+        return records, errors
+    
+    def test_scan_matches_dictreader(self):
+        rng = random.Random(7)
+        for iteration in range(1500):
+            chatlog.CSV_SCAN_CHUNK_SIZE = rng.choice([1, 7, 64, 1 << 20])
+            header = ["conversation_id", "sender", "timestamp", "message"]
+            if iteration % 3 == 1:
+                rng.shuffle(header)
+            if iteration % 17 == 0:
+                header = header[:3]
+            
+            rows = []
+            for _ in range(rng.randint(0, 8)):
+                width = rng.choice([4, 4, 4, 4, 3, 5, 1])
+                rows.append(["".join(rng.choice(self.PIECES) for _ in range(rng.randint(0, 3))) for _ in range(width)])
+            output = StringIO()
+            writer = csv.writer(output, lineterminator=rng.choice(["\n", "\r\n"]))
+            writer.writerow(header)
+            writer.writerows(rows)
+            data = output.getvalue()
+            
+            # Mix in malformed exports and leading or missing newlines
+            if iteration % 5 == 0:
+                data = ",".join(header) + "\n" + "".join(rng.choice(self.PIECES + ["\n"]) for _ in range(rng.randint(0, 40)))
+            if iteration % 11 == 0:
+                data = "\n" + data
+            if iteration % 13 == 0:
+                data = data.rstrip("\n")
+            
+            expected = self.dictreader_parse(data)
+            self.assertEqual(self.summarizer.parse_input(data, "csv"), expected, repr(data))
+            encoded = data.encode("utf-8")
+            if iteration % 7 == 0:
+                encoded = b"\xef\xbb\xbf" + encoded
+            self.assertEqual(self.summarizer.parse_input(encoded, "csv"), expected, repr(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import json
+import unittest
+
+from support import chatlog
+
+
+class JsonParseTest(unittest.TestCase):
+    def test_records_match_dict_decoding(self):
+        summarizer = chatlog.ChatLogSummarizer()
+        records = [
+            {"conversation_id": "c1", "sender": "agent", "timestamp": "t", "message": "hello"},
+            {"message": "reordered", "timestamp": "t", "sender": "agent", "conversation_id": "c1"},
+            {"conversation_id": "c1", "sender": "agent", "timestamp": "t", "message": ""},
+            {"conversation_id": "c2", "sender": None, "timestamp": "t", "message": "null sender"},
+            {"conversation_id": 7, "sender": "agent", "timestamp": "t", "message": "numeric id"},
+            {"sender": "agent", "timestamp": "t", "message": "missing id", "extra": True},
+            "not an object",
+        ]
+        data = json.dumps({"conversations": records})
+        
+        expected_errors = []
+        for row_number, record in enumerate(records, 1):
+            expected_errors.extend(summarizer.validate_record(record, row_number))
+        expected = [chatlog.Message.from_mapping(record) if isinstance(record, dict) else record for record in records]
+        self.assertEqual(summarizer.parse_input(data, "json"), (expected, expected_errors))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import copy
+import pickle
+import random
+import unittest
+
+from support import chatlog
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def setUp(self):
+        max_patterns = chatlog.DIRECT_SCAN_MAX_PATTERNS
+        self.addCleanup(setattr, chatlog, "DIRECT_SCAN_MAX_PATTERNS", max_patterns)
+    
+    def test_direct_scan_matches_automaton(self):
+        rng = random.Random(5)
+        
+        def word():
+            return "".join(rng.choice("ab c_") for _ in range(rng.randint(0, 3)))
+        
+        for _ in range(2000):
+            positive_words = [word().replace(" ", "") for _ in range(rng.randint(0, 4))]
+            negative_words = [word().replace(" ", "") for _ in range(rng.randint(0, 4))]
+            category_keywords = {f"C{index}": [word() for _ in range(rng.randint(0, 3))] for index in range(rng.randint(0, 3))}
+            texts = [word() * rng.randint(0, 4) for _ in range(rng.randint(1, 5))]
+            
+            chatlog.DIRECT_SCAN_MAX_PATTERNS = 1 << 20
+            direct = chatlog.KeywordMatcher(positive_words, negative_words, category_keywords)
+            chatlog.DIRECT_SCAN_MAX_PATTERNS = -1
+            automaton = chatlog.KeywordMatcher(positive_words, negative_words, category_keywords)
+            self.assertTrue(direct.direct_scan)
+            self.assertFalse(automaton.direct_scan)
+            
+            positive_hits, negative_hits, categories = direct.scan(texts)
+            self.assertEqual((positive_hits, negative_hits, categories), automaton.scan(texts))
+            self.assertEqual(sum(positive_hits), sum(" ".join(texts).count(word) for word in positive_words))
+    
+    def test_edited_word_lists_are_recompiled(self):
+        summarizer = chatlog.ChatLogSummarizer()
+        messages = [{"message": "The zzyzx was late"}]
+        self.assertEqual(summarizer.calculate_sentiment(messages)["negative_count"], 0)
+        summarizer.negative_words.append("zzyzx")
+        self.assertEqual(summarizer.calculate_sentiment(messages)["negative_count"], 1)
+        summarizer.category_keywords["Critique"] += ["late"]
+        self.assertEqual(summarizer.categorize_chat(messages)["dominant_category"], "Critique")
+    
+    
+    def test_edits_are_tracked_per_summarizer(self):
+        summarizer = chatlog.ChatLogSummarizer()
+        summarizer.get_lexicon()
+        other = chatlog.ChatLogSummarizer()
+        other.positive_words = ["zzyzx"]
+        self.assertFalse(summarizer._lexicon_dirty)
+        self.assertIs(summarizer.get_lexicon(), chatlog.default_lexicon())
+        self.assertIsNot(other.get_lexicon(), chatlog.default_lexicon())
+    
+    def test_copies_keep_tracking_edits(self):
+        summarizer = chatlog.ChatLogSummarizer()
+        messages = [{"message": "zzyzx"}]
+        for clone in (copy.deepcopy(summarizer), pickle.loads(pickle.dumps(summarizer))):
+            clone.positive_words.append("zzyzx")
+            self.assertEqual(clone.calculate_sentiment(messages)["positive_count"], 1)
+        self.assertEqual(summarizer.calculate_sentiment(messages)["positive_count"], 0)
+    
+    def test_word_lists_copy_as_plain_containers(self):
+        summarizer = chatlog.ChatLogSummarizer()
+        self.assertIsInstance(summarizer.positive_words, list)
+        self.assertIs(type(copy.copy(summarizer.positive_words)), list)
+        keywords = pickle.loads(pickle.dumps(summarizer.category_keywords))
+        self.assertIs(type(keywords), dict)
+        self.assertEqual({type(value) for value in keywords.values()}, {list})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Versioned rule sets, their reloads and their use by the service"""
+import json
+import os
+import tempfile
+import unittest
+
+from support import chatlog, http_request
+
+DATA = "conversation_id,sender,timestamp,message\nc1,customer,01-02-2023,hello hello there\n"
+
+
+class RegistryFiles:
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+    
+    def write_rules(self, name, rules, mtime):
+        path = os.path.join(self.directory, f"{name}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(rules if isinstance(rules, str) else json.dumps(rules))
+        # Set the modification time explicitly, however coarse the file system clock
+        os.utime(path, ns=(mtime, mtime))
+        return path
+
+
+class LexiconRegistryTest(RegistryFiles, unittest.TestCase):
+    def test_versions_bump_on_register_and_reload(self):
+        registry = chatlog.LexiconRegistry()
+        self.assertEqual(registry.register("retail", {"positive_words": ["hello"]}).version, 1)
+        self.assertEqual(registry.register("retail", {"positive_words": ["hi"]}).version, 2)
+        
+        path = self.write_rules("support", {"negative_words": ["broken"]}, mtime=10 ** 18)
+        self.assertEqual(registry.load("support", path).version, 1)
+        self.assertEqual(registry.reload(), [])
+        self.write_rules("support", {"negative_words": ["late"]}, mtime=10 ** 18 + 10 ** 9)
+        self.assertEqual(registry.reload(), ["support"])
+        self.assertEqual(registry.get("support").version, 2)
+        self.assertEqual(registry.get("support").negative_words, ("late",))
+        self.assertEqual(registry.names(), ["retail", "support"])
+    
+    def test_failed_reload_keeps_current_version(self):
+        registry = chatlog.LexiconRegistry()
+        bad = self.write_rules("bad", {"positive_words": ["good"]}, mtime=10 ** 18)
+        good = self.write_rules("good", {"positive_words": ["nice"]}, mtime=10 ** 18)
+        registry.load("bad", bad)
+        registry.load("good", good)
+        
+        self.write_rules("bad", "{not json", mtime=10 ** 18 + 10 ** 9)
+        self.write_rules("good", {"positive_words": ["fine"]}, mtime=10 ** 18 + 10 ** 9)
+        with self.assertRaises(ValueError) as raised:
+            registry.reload()
+        self.assertIn("Failed to parse lexicon 'bad'", str(raised.exception))
+        self.assertEqual((registry.get("bad").version, registry.get("bad").positive_words), (1, ("good",)))
+        # The other changed file is still reloaded
+        self.assertEqual((registry.get("good").version, registry.get("good").positive_words), (2, ("fine",)))
+        
+        self.write_rules("bad", {"category_keywords": {"Refund": ["refund"]}}, mtime=10 ** 18 + 2 * 10 ** 9)
+        with self.assertRaises(ValueError):
+            registry.reload()
+        self.assertEqual(registry.get("bad").version, 1)
+    
+    def test_summarizers_keep_their_version(self):
+        registry = chatlog.LexiconRegistry()
+        registry.register("retail", {"positive_words": ["hello"]})
+        before = registry.summarizer("retail")
+        registry.register("retail", {"positive_words": ["there"]})
+        after = registry.summarizer("retail")
+        
+        self.assertEqual(before.get_lexicon().version, 1)
+        self.assertEqual(after.get_lexicon().version, 2)
+        messages = [{"message": "hello hello there"}]
+        self.assertEqual(before.analyze_conversation("c1", messages)["sentiment"]["positive_count"], 2)
+        self.assertEqual(after.analyze_conversation("c1", messages)["sentiment"]["positive_count"], 1)
+
+
+class ServiceLexiconTest(RegistryFiles, unittest.IsolatedAsyncioTestCase):
+    async def start_service(self, **kwargs):
+        service = chatlog.AnalysisService(port=0, workers=1, **kwargs)
+        await service.start()
+        self.addAsyncCleanup(service.close)
+        return service
+    
+    async def positive_count(self, service, lexicon=None):
+        target = "/analyze?format=csv&output=jsonl" + (f"&lexicon={lexicon}" if lexicon else "")
+        status, _, body = await http_request(service.port, "POST", target, DATA.encode("utf-8"))
+        self.assertEqual(status, 200, body)
+        return json.loads(body)["positive_count"]
+    
+    async def test_requests_pick_a_lexicon(self):
+        registry = chatlog.LexiconRegistry()
+        registry.register("retail", {"positive_words": ["hello"]})
+        service = await self.start_service(registry=registry)
+        self.assertEqual(await self.positive_count(service), 0)
+        self.assertEqual(await self.positive_count(service, "retail"), 2)
+        status, _, body = await http_request(service.port, "POST", "/analyze?format=csv&lexicon=missing", DATA.encode("utf-8"))
+        self.assertEqual(status, 400)
+        self.assertIn("Unknown lexicon 'missing'", body)
+    
+    async def test_reload_publishes_new_version(self):
+        path = self.write_rules("retail", {"positive_words": ["hello"]}, mtime=10 ** 18)
+        registry = chatlog.LexiconRegistry()
+        registry.load("retail", path)
+        service = await self.start_service(registry=registry, default_lexicon="retail")
+        self.assertEqual(await self.positive_count(service), 2)
+        
+        self.write_rules("retail", {"positive_words": ["there"]}, mtime=10 ** 18 + 10 ** 9)
+        self.assertEqual(service.reload(), ["retail"])
+        # The workers started with version 1, so version 2 travels with the batch
+        self.assertEqual(await self.positive_count(service), 1)
+        self.assertEqual(await self.positive_count(service, "retail"), 1)
+        
+        self.write_rules("retail", "[]", mtime=10 ** 18 + 2 * 10 ** 9)
+        self.assertIsNone(service.reload())
+        self.assertEqual(await self.positive_count(service), 1)
+        stats = service.stats()
+        self.assertEqual((stats["lexicons"], stats["reload_errors"]), ({"retail": 2}, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
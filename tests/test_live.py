@@ -0,0 +1,173 @@
+"""Live summaries of followed logs and the file tailer behind them"""
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+from support import chatlog, shuffled_records
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class LiveSummarizerTest(unittest.TestCase):
+    def assertMatchesAnalysis(self, summarizer, records):
+        live = chatlog.LiveSummarizer(summarizer)
+        for record in records:
+            live.add(record)
+        conversations = {}
+        for record in records:
+            conversations.setdefault(record["conversation_id"], []).append(record)
+        self.assertEqual(len(live), len(conversations))
+        for conversation_id, messages in conversations.items():
+            expected = summarizer.analyze_conversation(conversation_id, messages)
+            del expected["word_counts"]
+            self.assertEqual(live.summary(conversation_id), expected, conversation_id)
+    
+    def test_summaries_match_analyze_conversation(self):
+        self.assertMatchesAnalysis(chatlog.ChatLogSummarizer(), shuffled_records())
+    
+    def test_phrases_spanning_messages(self):
+        # Enough keywords to use the automaton, which carries its state across messages
+        summarizer = chatlog.ChatLogSummarizer()
+        summarizer.positive_words = summarizer.positive_words + [f"word{i}" for i in range(chatlog.DIRECT_SCAN_MAX_PATTERNS)] + ["very good"]
+        records = [
+            {"conversation_id": "c1", "sender": "customer", "timestamp": "t", "message": "it was very"},
+            {"conversation_id": "c2", "sender": "customer", "timestamp": "t", "message": "a bad problem"},
+            {"conversation_id": "c1", "sender": "agent", "timestamp": "t", "message": "Good to hear, word3"},
+        ]
+        self.assertMatchesAnalysis(summarizer, records)
+    
+    def test_on_change_reports_classification_changes(self):
+        changes = []
+        live = chatlog.LiveSummarizer(on_change=lambda *change: changes.append(change))
+        live.add({"conversation_id": "c1", "message": "hello there"})
+        live.add({"conversation_id": "c1", "message": "thanks"})
+        live.add({"conversation_id": "c1", "message": "this is a bad problem"})
+        self.assertEqual(changes[0], ("c1", None, ("Neutral", "Other")))
+        self.assertEqual(len(changes), 2)
+        self.assertEqual(changes[1][1], ("Neutral", "Other"))
+        self.assertEqual(changes[1][2][0], "Negative")
+    
+    def test_ttl_eviction(self):
+        clock = FakeClock()
+        live = chatlog.LiveSummarizer(ttl=10, clock=clock)
+        live.add({"conversation_id": "old", "message": "hi"})
+        clock.now = 5
+        live.add({"conversation_id": "new", "message": "hi"})
+        clock.now = 12
+        live.evict()
+        self.assertEqual(list(live.conversations), ["new"])
+        clock.now = 14
+        # Activity keeps a conversation alive
+        live.add({"conversation_id": "new", "message": "still here"})
+        clock.now = 20
+        live.evict()
+        self.assertEqual((list(live.conversations), live.evicted), (["new"], 1))
+        clock.now = 24
+        live.evict()
+        self.assertEqual((len(live), live.evicted), (0, 2))
+    
+    def test_lru_eviction(self):
+        live = chatlog.LiveSummarizer(max_conversations=2)
+        for conversation_id in ("a", "b", "a", "c"):
+            live.add({"conversation_id": conversation_id, "message": "hi"})
+        self.assertEqual(list(live.conversations), ["a", "c"])
+        self.assertEqual(live.evicted, 1)
+        self.assertEqual(live.summary("a")["metrics"]["total_messages"], 2)
+
+
+class TailLinesTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "chat.log")
+    
+    def write(self, text, mode="a"):
+        with open(self.path, mode, encoding="utf-8", newline="") as f:
+            f.write(text)
+    
+    def read_until_caught_up(self, lines):
+        """Return the (generation, line) items up to the next None"""
+        items = []
+        for item in lines:
+            if item is None:
+                return items
+            items.append(item)
+    
+    def test_follows_appends_and_partial_lines(self):
+        self.write("one\r\ntwo\npart")
+        lines = chatlog.tail_lines(self.path, poll_interval=0)
+        self.addCleanup(lines.close)
+        self.assertEqual(self.read_until_caught_up(lines), [(0, "one"), (0, "two")])
+        self.write("ial\nthree\n")
+        self.assertEqual(self.read_until_caught_up(lines), [(0, "partial"), (0, "three")])
+        self.assertEqual(self.read_until_caught_up(lines), [])
+    
+    def test_waits_for_missing_file(self):
+        lines = chatlog.tail_lines(self.path, poll_interval=0)
+        self.addCleanup(lines.close)
+        self.assertEqual(self.read_until_caught_up(lines), [])
+        self.write("first\n")
+        self.assertEqual(self.read_until_caught_up(lines), [(0, "first")])
+    
+    def test_rotation(self):
+        self.write("old 1\nold 2\n")
+        lines = chatlog.tail_lines(self.path, poll_interval=0)
+        self.addCleanup(lines.close)
+        self.assertEqual(self.read_until_caught_up(lines), [(0, "old 1"), (0, "old 2")])
+        os.rename(self.path, self.path + ".1")
+        self.write("new 1\n", "w")
+        self.assertEqual(self.read_until_caught_up(lines), [(1, "new 1")])
+    
+    def test_truncation(self):
+        self.write("a long first line\nand a second\n")
+        lines = chatlog.tail_lines(self.path, poll_interval=0)
+        self.addCleanup(lines.close)
+        self.read_until_caught_up(lines)
+        self.write("short\n", "r+")
+        os.truncate(self.path, len("short\n"))
+        self.assertEqual(self.read_until_caught_up(lines), [(1, "short")])
+    
+    def test_from_end_keeps_header(self):
+        self.write("conversation_id,sender,timestamp,message\nc1,customer,t,old\n")
+        lines = chatlog.tail_lines(self.path, poll_interval=0, from_start=False, header_lines=1)
+        self.addCleanup(lines.close)
+        self.assertEqual(self.read_until_caught_up(lines), [(0, "conversation_id,sender,timestamp,message")])
+        self.write("c1,customer,t,new\n")
+        self.assertEqual(self.read_until_caught_up(lines), [(0, "c1,customer,t,new")])
+    
+    def test_follow_rotated_csv(self):
+        header = "conversation_id,sender,timestamp,message\n"
+        records = shuffled_records(conversations=4, messages=3)
+        rows = io.StringIO()
+        csv.writer(rows, lineterminator="\n").writerows([r["conversation_id"], r["sender"], r["timestamp"], r["message"]] for r in records)
+        rows = rows.getvalue().splitlines(keepends=True)
+        self.write(header + "".join(rows[:6]))
+        
+        polls = []
+        def stop():
+            # Rotate to a new file with its own header after the first catch-up
+            polls.append(None)
+            if len(polls) == 2:
+                os.rename(self.path, self.path + ".1")
+                self.write(header + "".join(rows[6:]), "w")
+            return len(polls) > 4
+        
+        summarizer = chatlog.ChatLogSummarizer()
+        live = summarizer.follow(self.path, poll_interval=0, stop=stop)
+        for conversation_id in {record["conversation_id"] for record in records}:
+            messages = [record for record in records if record["conversation_id"] == conversation_id]
+            expected = summarizer.analyze_conversation(conversation_id, messages)
+            self.assertEqual(live.summary(conversation_id)["metrics"], expected["metrics"])
+            self.assertEqual(live.summary(conversation_id)["sentiment"], expected["sentiment"])
+
+
+if __name__ == "__main__":
+    unittest.main()
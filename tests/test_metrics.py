@@ -0,0 +1,67 @@
+"""Stage instrumentation and its exports"""
+import json
+import unittest
+
+from support import benchmark, chatlog, shuffled_records
+
+
+class StageMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.data = benchmark.format_records(shuffled_records(), "json")
+    
+    def instrumented_run(self, workers=None):
+        metrics = chatlog.StageMetrics(top_n=3)
+        events = []
+        metrics.add_hook(lambda stage, event: events.append(stage))
+        report = chatlog.ChatLogSummarizer(metrics=metrics).process_data(self.data, "json", workers)
+        return metrics, events, report
+    
+    def test_workers_report_every_stage(self):
+        serial, serial_events, serial_report = self.instrumented_run()
+        pooled, pooled_events, pooled_report = self.instrumented_run(workers=2)
+        self.assertEqual(pooled_report, serial_report)
+        self.assertEqual(sorted(pooled.stages), sorted(serial.stages))
+        for stage in ("calculate_conversation_metrics", "keyword_scan", "calculate_sentiment", "categorize_chat"):
+            self.assertEqual(pooled.stages[stage]["calls"], 12, stage)
+            self.assertEqual(pooled.stages[stage]["records"], serial.stages[stage]["records"], stage)
+        self.assertEqual(sorted(pooled_events), sorted(serial_events))
+        self.assertEqual(len(pooled.slowest_conversations()), 3)
+    
+    def test_slowest_conversations_are_bounded_and_sorted(self):
+        metrics = chatlog.StageMetrics(top_n=2)
+        for conversation_id, seconds in [("a", 0.3), ("b", 0.1), ("c", 0.5), ("d", 0.2)]:
+            metrics.record_conversation(conversation_id, seconds)
+        self.assertEqual(metrics.slowest_conversations(), [("c", 0.5), ("a", 0.3)])
+    
+    def test_hooks_receive_each_event(self):
+        metrics = chatlog.StageMetrics()
+        calls = []
+        metrics.add_hook(lambda stage, event: calls.append((stage, event["records"], event["bytes_out"])))
+        metrics.finish("render_report", metrics.start(), records=2, bytes_out=10)
+        metrics.merge([("keyword_scan", {"wall_seconds": 0.5, "cpu_seconds": 0.25, "records": 4, "bytes_in": 8, "bytes_out": 0})], [])
+        self.assertEqual(calls, [("render_report", 2, 10), ("keyword_scan", 4, 0)])
+        self.assertEqual(metrics.stages["keyword_scan"]["wall_seconds"], 0.5)
+    
+    def test_to_json(self):
+        metrics, _, _ = self.instrumented_run()
+        exported = json.loads(metrics.to_json())
+        self.assertEqual(exported, json.loads(json.dumps(metrics.to_dict())))
+        self.assertEqual(exported["stages"]["parse_input"]["calls"], 1)
+        self.assertEqual(len(exported["slowest_conversations"]), 3)
+        self.assertEqual(set(exported["slowest_conversations"][0]), {"conversation_id", "seconds"})
+    
+    def test_to_prometheus(self):
+        metrics = chatlog.StageMetrics()
+        metrics.record("parse_input", {"wall_seconds": 1.5, "cpu_seconds": 1.0, "records": 3, "bytes_in": 40, "bytes_out": 0})
+        metrics.record_conversation('say "hi"\n', 0.25)
+        lines = metrics.to_prometheus(prefix="test").splitlines()
+        self.assertIn("# TYPE test_stage_calls_total counter", lines)
+        self.assertIn('test_stage_calls_total{stage="parse_input"} 1', lines)
+        self.assertIn('test_stage_bytes_in_total{stage="parse_input"} 40', lines)
+        self.assertIn('test_stage_wall_seconds_total{stage="parse_input"} 1.5', lines)
+        self.assertIn("# TYPE test_slowest_conversation_seconds gauge", lines)
+        self.assertIn('test_slowest_conversation_seconds{conversation_id="say \\"hi\\"\\n"} 0.25', lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""Report rendering options"""
+import unittest
+
+from support import chatlog, read_fixture
+
+
+class SummaryVerbosityTest(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = chatlog.ChatLogSummarizer()
+    
+    def test_summary_leaves_out_per_message_counts(self):
+        report = self.summarizer.process_data(chatlog.EXAMPLE_JSON, "json", verbosity=chatlog.VERBOSITY_SUMMARY)
+        self.assertNotIn("Words from each message", report)
+        self.assertNotIn("     - Message 1:", report)
+        self.assertIn("   - Sum of all word counts:", report)
+    
+    def test_summary_is_full_report_without_word_list(self):
+        full = read_fixture("example_report.md")
+        expected = "".join(
+            line for line in full.splitlines(keepends=True)
+            if not line.startswith(("   - Words from each message:", "     - Message "))
+        )
+        report = self.summarizer.process_data(chatlog.EXAMPLE_JSON, "json", verbosity=chatlog.VERBOSITY_SUMMARY)
+        self.assertEqual(report, expected)
+        self.assertEqual(self.summarizer.process_data(chatlog.EXAMPLE_JSON, "json"), full)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""The HTTP analysis service, driven over real sockets"""
+import asyncio
+import json
+import unittest
+
+from support import chatlog, http_request
+
+
+class AnalysisServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def start_service(self, **kwargs):
+        service = chatlog.AnalysisService(port=0, workers=1, **kwargs)
+        await service.start()
+        self.addAsyncCleanup(service.close)
+        return service
+    
+    async def test_analyze_streams_report(self):
+        service = await self.start_service()
+        status, headers, body = await http_request(service.port, "POST", "/analyze?format=json", chatlog.EXAMPLE_JSON.encode("utf-8"))
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["transfer-encoding"], "chunked")
+        self.assertEqual(headers["content-type"], chatlog.SERVICE_CONTENT_TYPES["markdown"])
+        self.assertEqual(body, chatlog.ChatLogSummarizer().process_data(chatlog.EXAMPLE_JSON, "json"))
+    
+    async def test_oversized_body_is_rejected(self):
+        service = await self.start_service(max_body_size=10)
+        status, _, body = await http_request(service.port, "POST", "/analyze", b"x" * 11)
+        self.assertEqual(status, 413)
+        self.assertTrue(body.startswith("ERROR:"))
+    
+    async def test_busy_service_asks_to_retry(self):
+        service = await self.start_service(max_pending=0)
+        status, headers, _ = await http_request(service.port, "POST", "/analyze?format=json", chatlog.EXAMPLE_JSON.encode("utf-8"))
+        self.assertEqual(status, 503)
+        self.assertEqual(headers["retry-after"], "1")
+        self.assertEqual(service.stats()["rejected"], 1)
+    
+    async def test_failed_request_does_not_fail_its_batch(self):
+        service = await self.start_service(batch_wait=0.5)
+        good = http_request(service.port, "POST", "/analyze?format=json", chatlog.EXAMPLE_JSON.encode("utf-8"))
+        bad = http_request(service.port, "POST", "/analyze?format=json", b'{"conversations": [{"conversation_id": "c1"}]}')
+        (good_status, _, good_body), (bad_status, _, bad_body) = await asyncio.gather(good, bad)
+        self.assertEqual(service.batches, 1)
+        self.assertEqual(good_status, 200)
+        self.assertIn("## Conversation ID: conv100", good_body)
+        self.assertEqual(bad_status, 422)
+        self.assertTrue(bad_body.startswith("ERROR:"))
+    
+    async def test_stats_report_latency_percentiles(self):
+        service = await self.start_service()
+        _, _, body = await http_request(service.port, "GET", "/stats")
+        self.assertEqual(json.loads(body)["p50_ms"], None)
+        for _ in range(3):
+            await http_request(service.port, "GET", "/health")
+        status, headers, body = await http_request(service.port, "GET", "/stats")
+        stats = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["content-type"], "application/json")
+        self.assertEqual(stats["requests"], 0)
+        self.assertGreater(stats["p50_ms"], 0)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+    
+    async def test_latency_percentiles(self):
+        service = chatlog.AnalysisService()
+        service.latencies.extend(seconds / 1000 for seconds in range(1, 101))
+        self.assertEqual(service.latency_percentiles(), {"p50_ms": 51.0, "p99_ms": 100.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from support import benchmark, chatlog, shuffled_records, stream_report
+
+
+class SpillTest(unittest.TestCase):
+    def test_spilled_grouping_matches_in_memory(self):
+        records = shuffled_records()
+        for format_type in ("csv", "json"):
+            data = benchmark.format_records(records, format_type)
+            expected = chatlog.ChatLogSummarizer().process_data(data, format_type)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                for memory_limit in (1, 4096, None):
+                    summarizer = chatlog.ChatLogSummarizer(memory_limit=memory_limit, temp_dir=temp_dir)
+                    self.assertEqual(stream_report(summarizer, data, format_type), expected, (format_type, memory_limit))
+                    self.assertEqual(os.listdir(temp_dir), [])
+    
+    
+    def spill(self, records, partitions, memory_limit):
+        spilled = chatlog.SpilledConversations(partitions=partitions, memory_limit=memory_limit)
+        self.addCleanup(spilled.close)
+        for record in records:
+            spilled.add(record)
+        spilled.finish()
+        return spilled
+    
+    def grouped(self, records):
+        conversations = {}
+        for record in records:
+            conversations.setdefault(record["conversation_id"], []).append(
+                (record["conversation_id"], record["sender"], record["timestamp"], record["message"])
+            )
+        return list(conversations.items())
+    
+    def spilled_items(self, spilled):
+        return [
+            (conversation_id, [(m.conversation_id, m.sender, m.timestamp, m.message) for m in messages])
+            for conversation_id, messages in spilled.items()
+        ]
+    
+    def test_oversized_partitions_are_split(self):
+        records = shuffled_records(conversations=200, messages=3)
+        memory_limit = 4 * (chatlog.RECORD_OVERHEAD_BYTES + 100)
+        splits = []
+        split = chatlog.SpilledConversations._split
+        
+        def recording_split(spilled, path, count):
+            parts, shared_key = split(spilled, path, count)
+            splits.append((path, parts, shared_key))
+            return parts, shared_key
+        
+        with mock.patch.object(chatlog.SpilledConversations, "_split", recording_split):
+            spilled = self.spill(records, 2, memory_limit)
+        self.assertEqual(len(spilled), 200)
+        self.assertEqual(self.spilled_items(spilled), self.grouped(records))
+        # Parts are split until they fit, then merged back to one file per partition
+        split_paths = {path for path, _, _ in splits}
+        leaves = [size for _, parts, shared_key in splits if not shared_key for path, size in parts if path not in split_paths]
+        self.assertTrue(leaves)
+        self.assertLessEqual(max(leaves), memory_limit)
+        self.assertEqual(len(spilled._sorted_paths), 2)
+    
+    def test_large_conversation_is_grouped_whole(self):
+        records = [{"conversation_id": "big", "sender": "customer", "timestamp": str(i), "message": "word " * 50} for i in range(20)]
+        records.insert(5, {"conversation_id": "small", "sender": "agent", "timestamp": "x", "message": "hello"})
+        spilled = self.spill(records, 1, 1000)
+        self.assertEqual(len(spilled), 2)
+        self.assertEqual(self.spilled_items(spilled), self.grouped(records))
+
+
+if __name__ == "__main__":
+    unittest.main()
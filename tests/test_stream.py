@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+from support import benchmark, chatlog, shuffled_records, stream_report
+
+
+class JsonStreamTest(unittest.TestCase):
+    def random_number(self, rng):
+        return rng.choice([
+            rng.randint(-10 ** 6, 10 ** 6),
+            rng.uniform(-1000, 1000),
+            rng.uniform(-1, 1) * 10 ** rng.randint(-30, 30),
+            0,
+            -0.0,
+        ])
+    
+    def test_decoding_matches_json_loads(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            document = {}
+            for index in range(rng.randint(0, 3)):
+                document[f"meta{index}"] = self.random_number(rng)
+            document["conversations"] = [
+                {
+                    "conversation_id": f"c{rng.randint(0, 3)}",
+                    "sender": "agent",
+                    "timestamp": "01-02-2023",
+                    "message": "é" * rng.randint(0, 3) + "\\u00e9 \"quoted\"",
+                    "score": self.random_number(rng),
+                    "scores": [self.random_number(rng) for _ in range(rng.randint(0, 3))],
+                }
+                for _ in range(rng.randint(0, 4))
+            ]
+            document["version"] = self.random_number(rng)
+            data = json.dumps(document, ensure_ascii=rng.random() < 0.5).encode("utf-8")
+            
+            expected = json.loads(data)["conversations"]
+            for chunk_size in (1, 2, 3, 5, 8, 13):
+                with self.subTest(data=data, chunk_size=chunk_size):
+                    self.assertEqual(list(chatlog.iter_json_conversations(io.BytesIO(data), chunk_size)), expected)
+    
+    def test_syntax_errors_are_raised(self):
+        for data in (b'{"conversations": [1 2]}', b'{"conversations": [1.}', b'{"conversations": [1, 1e]}'):
+            with self.assertRaises(ValueError):
+                list(chatlog.iter_json_conversations(io.BytesIO(data), 2))
+
+
+
+class ProcessStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = chatlog.ChatLogSummarizer()
+        self.records = shuffled_records()
+    
+    def test_grouped_input_matches_analyze_conversation(self):
+        records = sorted(self.records, key=lambda record: record["conversation_id"])
+        expected = {}
+        for record in records:
+            expected.setdefault(record["conversation_id"], []).append(record)
+        expected = [self.summarizer.analyze_conversation(conversation_id, messages) for conversation_id, messages in expected.items()]
+        for format_type in ("csv", "json"):
+            data = benchmark.format_records(records, format_type).encode("utf-8")
+            self.assertEqual(list(self.summarizer.process_stream(io.BytesIO(data), format_type)), expected)
+    
+    def test_unordered_input_raises(self):
+        data = benchmark.format_records(self.records, "csv").encode("utf-8")
+        with self.assertRaises(chatlog.ConversationOrderError):
+            list(self.summarizer.process_stream(io.BytesIO(data), "csv"))
+    
+    def test_unchecked_order_yields_each_run(self):
+        data = b"conversation_id,sender,timestamp,message\nc1,a,t,one\nc2,a,t,two\nc1,a,t,three\n"
+        results = self.summarizer.process_stream(io.BytesIO(data), "csv", check_order=False)
+        self.assertEqual([result["conversation_id"] for result in results], ["c1", "c2", "c1"])
+
+
+
+class StreamReportTest(unittest.TestCase):
+    def test_pipe_input_matches_seekable_input(self):
+        data = benchmark.format_records(shuffled_records(), "json")
+        expected = stream_report(chatlog.ChatLogSummarizer(), data, "json")
+        
+        read_fd, write_fd = os.pipe()
+        
+        def feed():
+            with open(write_fd, "wb") as pipe:
+                pipe.write(data.encode("utf-8"))
+        
+        writer = threading.Thread(target=feed)
+        writer.start()
+        sink = io.StringIO()
+        with tempfile.TemporaryDirectory() as temp_dir, open(read_fd, "rb") as pipe:
+            chatlog.ChatLogSummarizer(temp_dir=temp_dir).write_stream_report(pipe, "json", sink)
+            self.assertEqual(os.listdir(temp_dir), [])
+        writer.join()
+        self.assertEqual(sink.getvalue(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Structured records and their JSON Lines and columnar writers"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from support import chatlog
+
+
+class StructuredOutputTest(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = chatlog.ChatLogSummarizer()
+        self.records, errors = self.summarizer.process_structured(chatlog.EXAMPLE_JSON, "json")
+        self.assertEqual(errors, [])
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+    
+    def test_structured_record_flattens_result(self):
+        result = self.summarizer.analyze_conversation("c1", [{"message": "Great service, thank you"}, {"message": "I have a problem"}])
+        record = chatlog.structured_record(result)
+        self.assertEqual(record["conversation_id"], "c1")
+        self.assertEqual(record["total_messages"], 2)
+        self.assertEqual(record["total_words"], 8)
+        self.assertEqual(record["avg_words"], 4.0)
+        self.assertEqual(record["conversation_detail"], "Brief")
+        self.assertEqual((record["positive_count"], record["negative_count"]), (1, 1))
+        self.assertEqual(record["sentiment_category"], result["sentiment"]["sentiment_category"])
+        self.assertEqual(record["category_counts"], dict(result["categorization"]["category_counts"]))
+        self.assertEqual(record["dominant_category"], result["categorization"]["dominant_category"])
+        self.assertNotIn("word_counts", record)
+    
+    def test_write_jsonl(self):
+        records = self.records + [dict(self.records[0], conversation_id="café ")]
+        sink = io.StringIO()
+        self.assertEqual(chatlog.write_jsonl(records, sink), len(records))
+        text = sink.getvalue()
+        self.assertIn("café ", text)
+        self.assertEqual([json.loads(line) for line in text.split("\n")[:-1]], records)
+    
+    def test_service_output_matches_write_jsonl(self):
+        data = chatlog.EXAMPLE_JSON.replace("conv100", "café")
+        expected = io.StringIO()
+        chatlog.write_jsonl(self.summarizer.process_structured(data, "json")[0], expected)
+        
+        ok, chunks = chatlog._analyze_request(self.summarizer, data, "json", "jsonl", chatlog.VERBOSITY_FULL)
+        self.assertTrue(ok)
+        self.assertEqual("".join(chunks), expected.getvalue())
+        
+        ok, chunks = chatlog._analyze_request(self.summarizer, data, "json", "json", chatlog.VERBOSITY_FULL)
+        self.assertTrue(ok)
+        document = "".join(chunks)
+        self.assertIn('"café"', document)
+        self.assertEqual(json.loads(document), {"conversations": [json.loads(line) for line in expected.getvalue().splitlines()]})
+    
+    def expected_columns(self):
+        flat = [chatlog.flatten_record(record) for record in self.records]
+        return {name: [row.get(name) for row in flat] for name in flat[0]}
+    
+    def test_json_stand_in(self):
+        path = os.path.join(self.temp_dir, "results.json")
+        with mock.patch.object(chatlog, "pa", None):
+            self.assertEqual(chatlog.write_columnar(self.records, path), len(self.records))
+        with open(path, encoding="utf-8") as f:
+            written = json.load(f)
+        self.assertEqual(written["num_rows"], len(self.records))
+        self.assertEqual(written["columns"], self.expected_columns())
+        self.assertIn("category_counts.Complaint", written["columns"])
+    
+    def test_late_columns_are_padded(self):
+        path = os.path.join(self.temp_dir, "results.json")
+        with mock.patch.object(chatlog, "pa", None):
+            with chatlog.ColumnarWriter(path) as writer:
+                writer.write({"a": 1})
+                writer.write({"a": 2, "b": {"c": 3}})
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"num_rows": 2, "columns": {"a": [1, 2], "b.c": [None, 3]}})
+    
+    @unittest.skipIf(chatlog.pa is None, "pyarrow is not installed")
+    def test_arrow_and_parquet(self):
+        import pyarrow.parquet as pq
+        
+        expected = self.expected_columns()
+        records = self.records * 3
+        for name in ("results.arrow", "results.parquet"):
+            path = os.path.join(self.temp_dir, name)
+            # A small row group size makes the writer flush several batches
+            with chatlog.ColumnarWriter(path, row_group_size=2) as writer:
+                self.assertEqual(writer.write_all(records), len(records))
+            if name.endswith(".parquet"):
+                table = pq.read_table(path)
+            else:
+                with chatlog.pa.ipc.open_file(path) as reader:
+                    table = reader.read_all()
+            with self.subTest(name=name):
+                self.assertEqual(table.to_pydict(), {column: values * 3 for column, values in expected.items()})
+
+
+if __name__ == "__main__":
+    unittest.main()
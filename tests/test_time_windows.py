@@ -0,0 +1,100 @@
+"""Time-bucketed sentiment and category aggregates"""
+import random
+import unittest
+
+from support import benchmark, chatlog
+
+DAY = 86400
+
+
+class TimeWindowIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = chatlog.ChatLogSummarizer()
+        self.matcher = self.summarizer.get_matcher()
+        rng = random.Random(7)
+        records = []
+        for c in range(60):
+            day = rng.randint(1, 20)
+            for i, record in enumerate(benchmark.generate_records(self.summarizer, 1, 4, 8, 0.4, c)):
+                record["conversation_id"] = f"c{c}"
+                # Conversations run over several days and hours, some with unparsed timestamps
+                record["timestamp"] = rng.choice([
+                    f"2021-03-{day + i:02d}T{rng.randint(0, 23):02d}:15:00",
+                    f"{day + i:02d}-03-2021",
+                    "garbage" if i else f"{day:02d}-03-2021",
+                ])
+                records.append(record)
+        parsed, errors = self.summarizer.parse_input(benchmark.format_records(records, "csv"), "csv")
+        self.assertEqual(errors, [])
+        self.conversations = self.summarizer.validate_data(parsed)[1]
+    
+    def expected(self, bucket_seconds, start_bucket, end_bucket):
+        """Brute-force totals with each message in its own bucket"""
+        names = self.matcher.categories + ["Other"]
+        totals = {"conversations": 0, "messages": 0, "sentiment_score": 0, "category_counts": dict.fromkeys(self.summarizer.category_priority, 0)}
+        for messages in self.conversations.values():
+            epochs = [chatlog.parse_timestamp(msg["timestamp"]) for msg in messages]
+            first = min(epoch for epoch in epochs if epoch is not None)
+            if start_bucket <= first // bucket_seconds < end_bucket:
+                totals["conversations"] += 1
+            positive, negative, categories = self.matcher.scan([msg["message"].lower() for msg in messages])
+            for epoch, p, n, category in zip(epochs, positive, negative, categories):
+                if start_bucket <= (first if epoch is None else epoch) // bucket_seconds < end_bucket:
+                    totals["messages"] += 1
+                    totals["sentiment_score"] += p - n
+                    totals["category_counts"][names[category]] += 1
+        return totals
+    
+    def assertWindow(self, index, window):
+        start_bucket = chatlog.to_epoch(window["start"]) // index.bucket_seconds
+        end_bucket = chatlog.to_epoch(window["end"]) // index.bucket_seconds
+        expected = self.expected(index.bucket_seconds, start_bucket, end_bucket)
+        for key, value in expected.items():
+            self.assertEqual(window[key], value, (window["start"], key))
+    
+    def test_window(self):
+        for granularity in (chatlog.WINDOW_HOUR, chatlog.WINDOW_DAY):
+            index = self.summarizer.time_windows(self.conversations, granularity)
+            with self.subTest(granularity=granularity):
+                self.assertWindow(index, index.window("2021-03-05", "2021-03-09T12:00:00"))
+                self.assertWindow(index, index.window(0, 2 ** 31))
+                self.assertEqual(index.window(0, 2 ** 31)["conversations"], len(self.conversations))
+    
+    def test_sliding_and_tumbling(self):
+        for granularity in (chatlog.WINDOW_HOUR, chatlog.WINDOW_DAY):
+            index = self.summarizer.time_windows(self.conversations, granularity)
+            windows = list(index.sliding(5, 3)) + list(index.tumbling(4))
+            self.assertTrue(windows)
+            for window in windows:
+                self.assertWindow(index, window)
+    
+    def test_tumbling_windows_partition_the_totals(self):
+        index = self.summarizer.time_windows(self.conversations, chatlog.WINDOW_HOUR)
+        windows = list(index.tumbling(24))
+        everything = index.window(0, 2 ** 31)
+        self.assertEqual(sum(window["messages"] for window in windows), everything["messages"])
+        self.assertEqual(sum(window["sentiment_score"] for window in windows), everything["sentiment_score"])
+    
+    def test_out_of_order_additions_rebuild(self):
+        in_order = chatlog.TimeWindowIndex(["A", "B"])
+        shuffled = chatlog.TimeWindowIndex(["A", "B"])
+        rows = [(day * DAY, [1, day, day % 3 - 1, day % 2, 1 - day % 2]) for day in range(10)]
+        for epoch, row in rows:
+            in_order.add(epoch, list(row))
+        random.Random(1).shuffle(rows)
+        for i, (epoch, row) in enumerate(rows):
+            shuffled.add(epoch, list(row))
+            # Querying between additions must not freeze stale prefix sums
+            if i % 3 == 0:
+                shuffled.window(0, 10 * DAY)
+        self.assertEqual(list(shuffled.sliding(3)), list(in_order.sliding(3)))
+        self.assertEqual(shuffled.window(2 * DAY, 7 * DAY), in_order.window(2 * DAY, 7 * DAY))
+    
+    def test_conversation_without_timestamps(self):
+        index = chatlog.TimeWindowIndex(self.summarizer.category_priority)
+        self.assertFalse(index.add_conversation([{"timestamp": "soon", "message": "hi"}], [0], [0], ["Other"]))
+        self.assertEqual((index.unparsed, len(index)), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()